@@ -37,10 +37,21 @@ export interface UserIn {
     birth_year: number
     gender: GenderEnum
     is_admin?: boolean
-    avatar_base64: string | null
+    avatar: File | null
     password: string
 }
 
+function userFormData(payload: UserIn) {
+    const form = new FormData()
+    form.append('name', payload.name)
+    form.append('birth_year', String(payload.birth_year))
+    form.append('gender', payload.gender)
+    form.append('is_admin', String(!!payload.is_admin))
+    form.append('password', payload.password)
+    if (payload.avatar) form.append('avatar', payload.avatar)
+    return form
+}
+
 export async function login(username: string, password: string) {
     const {data} = await api.post<{ token: string }>(`/auth/login`, {username, password})
     tokenStorage.set(data.token)
@@ -60,18 +71,37 @@ export async function getMe() {
     return data
 }
 
-export async function listUsers() {
-    const {data} = await api.get<User[]>(`/user/`)
+export type UserSortField = 'created_at' | 'id' | 'name' | 'birth_year'
+
+export interface UserPage {
+    items: User[]
+    next_cursor: string | null
+}
+
+export interface ListUsersParams {
+    limit?: number
+    cursor?: string | null
+    sort?: UserSortField
+    order?: 'asc' | 'desc'
+    gender?: GenderEnum
+    is_admin?: boolean
+    birth_year_from?: number
+    birth_year_to?: number
+    created_by?: number
+}
+
+export async function listUsers(params: ListUsersParams = {}) {
+    const {data} = await api.get<UserPage>(`/user/`, {params})
     return data
 }
 
 export async function createUser(payload: UserIn) {
-    const {data} = await api.post<{ status: boolean }>(`/user/create`, payload)
+    const {data} = await api.post<{ status: boolean }>(`/user/create/form`, userFormData(payload))
     return data
 }
 
 export async function updateUser(user_id: number, payload: UserIn) {
-    const {data} = await api.patch<{ status: boolean }>(`/user/update`, payload, {params: {user_id}})
+    const {data} = await api.patch<{ status: boolean }>(`/user/update/form`, userFormData(payload), {params: {user_id}})
     return data
 }
 
@@ -90,4 +120,66 @@ export async function groupByMinutes(day: string, hour?: number) {
 export async function groupByHours(day: string) {
     const {data} = await api.get<Record<string, number>>(`/user/group_by_hours`, {params: {day}})
     return data
-}
\ No newline at end of file
+}
+
+export type RegistrationBucket = 'minute' | 'hour' | 'day' | 'week' | 'month'
+
+export interface RegistrationPoint {
+    start: string
+    count: number
+}
+
+export async function registrationSeries(from: string, to: string, bucket: RegistrationBucket, tz?: string) {
+    const params: any = {from, to, bucket}
+    if (tz) params.tz = tz
+    const {data} = await api.get<RegistrationPoint[]>(`/user/registrations`, {params})
+    return data
+}
+
+export type UserEventType = 'user_created' | 'user_updated' | 'user_deleted' | 'resync'
+
+export interface UserEvent {
+    type: UserEventType
+    ids: number[]
+    registrations: Record<string, number>
+}
+
+export function subscribeUserEvents(onEvent: (event: UserEvent) => void) {
+    const controller = new AbortController()
+    let retry = 5000
+    let disconnected = false
+
+    async function connect() {
+        while (!controller.signal.aborted) {
+            try {
+                const response = await fetch(`${API_BASE_URL}/user/events`, {
+                    headers: {'X-Token': tokenStorage.get()},
+                    signal: controller.signal,
+                })
+                if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`)
+                if (disconnected) onEvent({type: 'resync', ids: [], registrations: {}})
+                const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+                let buffer = ''
+                while (true) {
+                    const {value, done} = await reader.read()
+                    if (done) break
+                    const messages = (buffer + value).split('\n\n')
+                    buffer = messages.pop() ?? ''
+                    for (const message of messages) {
+                        for (const line of message.split('\n')) {
+                            if (line.startsWith('retry:')) retry = Number(line.slice(6)) || retry
+                            if (line.startsWith('data:')) onEvent(JSON.parse(line.slice(5)))
+                        }
+                    }
+                }
+            } catch {
+                if (controller.signal.aborted) return
+            }
+            disconnected = true
+            await new Promise(resolve => setTimeout(resolve, retry))
+        }
+    }
+
+    connect()
+    return () => controller.abort()
+}
@@ -1,7 +1,7 @@
-import {useEffect, useMemo, useState} from 'react'
+import {useEffect, useMemo, useRef, useState} from 'react'
 import {Bar} from 'react-chartjs-2'
 import {BarElement, CategoryScale, Chart, Legend, LinearScale, Tooltip} from 'chart.js'
-import {groupByHours, groupByMinutes} from '../lib/api'
+import {registrationSeries, subscribeUserEvents, type RegistrationBucket, type RegistrationPoint} from '../lib/api'
 
 Chart.register(CategoryScale, LinearScale, BarElement, Tooltip, Legend)
 
@@ -9,111 +9,151 @@ function formatDay(d: Date) {
     return d.toISOString().slice(0, 10)
 }
 
-function minutesOfHour(): string[] {
-    const res: string[] = []
-    for (let m = 0; m < 60; m++) {
-        res.push(String(m).padStart(2, '0'))
-    }
-    return res
+function shiftDay(day: string, days: number) {
+    const d = new Date(`${day}T00:00:00Z`)
+    d.setUTCDate(d.getUTCDate() + days)
+    return formatDay(d)
+}
+
+function pad(n: number) {
+    return String(n).padStart(2, '0')
+}
+
+type ChartType = 'minutes' | 'hours' | 'days' | 'weeks' | 'months'
+
+const BUCKETS: Record<ChartType, RegistrationBucket> = {
+    minutes: 'minute',
+    hours: 'hour',
+    days: 'day',
+    weeks: 'week',
+    months: 'month',
+}
+
+const TITLES: Record<ChartType, string> = {
+    minutes: 'Регистрации в минуту',
+    hours: 'Регистрации в час',
+    days: 'Регистрации в день',
+    weeks: 'Регистрации в неделю',
+    months: 'Регистрации в месяц',
 }
 
-function hoursOfDay(): string[] {
-    const res: string[] = []
-    for (let h = 0; h < 24; h++) {
-        res.push(String(h).padStart(2, '0'))
+function formatLabel(start: string, chartType: ChartType) {
+    switch (chartType) {
+        case 'minutes':
+            return start.slice(11, 16)
+        case 'hours':
+            return start.slice(11, 13)
+        case 'months':
+            return start.slice(0, 7)
+        default:
+            return start.slice(0, 10)
     }
-    return res
 }
 
-type ChartType = 'minutes' | 'hours'
+const timeZone = Intl.DateTimeFormat().resolvedOptions().timeZone
 
 export default function ChartPage() {
     const [day, setDay] = useState<string>(formatDay(new Date()))
     const [hour, setHour] = useState<number>(0)
+    const [fromDay, setFromDay] = useState<string>(shiftDay(formatDay(new Date()), -30))
+    const [toDay, setToDay] = useState<string>(formatDay(new Date()))
     const [chartType, setChartType] = useState<ChartType>('hours')
-    const [minutesData, setMinutesData] = useState<Record<string, number>>({})
-    const [hoursData, setHoursData] = useState<Record<string, number>>({})
+    const [points, setPoints] = useState<RegistrationPoint[]>([])
     const [loading, setLoading] = useState(false)
     const [error, setError] = useState('')
 
-    async function loadMinutesData() {
-        setLoading(true)
-        setError('')
-        try {
-            const data = await groupByMinutes(day, hour)
-            console.log('Minutes data:', data)
-            setMinutesData(data)
-        } catch (e) {
-            setError('Не удалось загрузить данные по минутам')
-        } finally {
-            setLoading(false)
+    function range(): [string, string] {
+        if (chartType === 'minutes') {
+            const to = hour < 23 ? `${day}T${pad(hour + 1)}:00` : `${shiftDay(day, 1)}T00:00`
+            return [`${day}T${pad(hour)}:00`, to]
         }
+        if (chartType === 'hours') {
+            return [`${day}T00:00`, `${shiftDay(day, 1)}T00:00`]
+        }
+        return [`${fromDay}T00:00`, `${shiftDay(toDay, 1)}T00:00`]
     }
 
-    async function loadHoursData() {
-        setLoading(true)
+    async function load(silent = false) {
+        if (!silent) setLoading(true)
         setError('')
         try {
-            const data = await groupByHours(day)
-            console.log('Hours data:', data)
-            setHoursData(data)
+            const [from, to] = range()
+            setPoints(await registrationSeries(from, to, BUCKETS[chartType], timeZone))
         } catch (e) {
-            setError('Не удалось загрузить данные по часам')
+            setError('Не удалось загрузить данные')
         } finally {
             setLoading(false)
         }
     }
 
-    async function load() {
-        if (chartType === 'minutes') {
-            await loadMinutesData()
-        } else {
-            await loadHoursData()
-        }
-    }
-
     useEffect(() => {
         load()
-    }, [day, hour, chartType])
+    }, [day, hour, fromDay, toDay, chartType])
 
-    const minutesLabels = useMemo(() => minutesOfHour(), [])
-    const hoursLabels = useMemo(() => hoursOfDay(), [])
+    const loadRef = useRef(load)
+    loadRef.current = load
 
-    const minutesChartData = useMemo(() => ({
-        labels: minutesLabels,
-        datasets: [{
-            label: `Регистрации в минуту (${String(hour).padStart(2, '0')}:00-${String(hour).padStart(2, '0')}:59)`,
-            data: minutesLabels.map(m => {
-                const timeKey = `${String(hour).padStart(2, '0')}:${m}`
-                return minutesData[timeKey] || 0
-            }),
-            backgroundColor: 'rgba(54, 162, 235, 0.6)'
-        }]
-    }), [minutesLabels, minutesData, hour])
+    useEffect(() => {
+        let timer: ReturnType<typeof setTimeout> | undefined
+        const unsubscribe = subscribeUserEvents(event => {
+            if (event.type !== 'resync' && Object.keys(event.registrations).length === 0) return
+            clearTimeout(timer)
+            timer = setTimeout(() => loadRef.current(true), 1000)
+        })
+        return () => {
+            clearTimeout(timer)
+            unsubscribe()
+        }
+    }, [])
 
-    const hoursChartData = useMemo(() => ({
-        labels: hoursLabels,
+    const chartData = useMemo(() => ({
+        labels: points.map(p => formatLabel(p.start, chartType)),
         datasets: [{
-            label: 'Регистрации в час',
-            data: hoursLabels.map(h => hoursData[h] || 0),
-            backgroundColor: 'rgba(75, 192, 192, 0.6)'
+            label: TITLES[chartType],
+            data: points.map(p => p.count),
+            backgroundColor: chartType === 'minutes' ? 'rgba(54, 162, 235, 0.6)' : 'rgba(75, 192, 192, 0.6)'
         }]
-    }), [hoursLabels, hoursData])
+    }), [points, chartType])
 
-    const currentChartData = chartType === 'minutes' ? minutesChartData : hoursChartData
+    const isRange = chartType === 'days' || chartType === 'weeks' || chartType === 'months'
 
     return (
         <div className="py-2">
             <div className="d-flex align-items-end gap-3 mb-3 flex-wrap">
-                <div>
-                    <label className="form-label">День</label>
-                    <input
-                        type="date"
-                        className="form-control"
-                        value={day}
-                        onChange={e => setDay(e.target.value)}
-                    />
-                </div>
+                {!isRange && (
+                    <div>
+                        <label className="form-label">День</label>
+                        <input
+                            type="date"
+                            className="form-control"
+                            value={day}
+                            onChange={e => setDay(e.target.value)}
+                        />
+                    </div>
+                )}
+
+                {isRange && (
+                    <>
+                        <div>
+                            <label className="form-label">С</label>
+                            <input
+                                type="date"
+                                className="form-control"
+                                value={fromDay}
+                                onChange={e => setFromDay(e.target.value)}
+                            />
+                        </div>
+                        <div>
+                            <label className="form-label">По</label>
+                            <input
+                                type="date"
+                                className="form-control"
+                                value={toDay}
+                                onChange={e => setToDay(e.target.value)}
+                            />
+                        </div>
+                    </>
+                )}
 
                 <div>
                     <label className="form-label">Тип графика</label>
@@ -124,6 +164,9 @@ export default function ChartPage() {
                     >
                         <option value="hours">По часам</option>
                         <option value="minutes">По минутам</option>
+                        <option value="days">По дням</option>
+                        <option value="weeks">По неделям</option>
+                        <option value="months">По месяцам</option>
                     </select>
                 </div>
 
@@ -137,7 +180,7 @@ export default function ChartPage() {
                         >
                             {Array.from({length: 24}, (_, i) => (
                                 <option key={i} value={i}>
-                                    {String(i).padStart(2, '0')}:00
+                                    {pad(i)}:00
                                 </option>
                             ))}
                         </select>
@@ -146,7 +189,7 @@ export default function ChartPage() {
 
                 <button
                     className="btn btn-outline-secondary"
-                    onClick={load}
+                    onClick={() => load()}
                     disabled={loading}
                 >
                     Обновить
@@ -161,7 +204,7 @@ export default function ChartPage() {
                         'Загрузка...'
                     ) : (
                         <Bar
-                            data={currentChartData}
+                            data={chartData}
                             options={{
                                 responsive: true,
                                 scales: {
@@ -170,7 +213,7 @@ export default function ChartPage() {
                                         ticks: {
                                             stepSize: 1
                                         },
-                                        max: Math.max(...Object.values(currentChartData.datasets[0]?.data || [0])) * 1.25
+                                        max: Math.max(0, ...chartData.datasets[0].data) * 1.25 || undefined
                                     }
                                 }
                             }}
@@ -180,4 +223,4 @@ export default function ChartPage() {
             </div>
         </div>
     )
-} 
\ No newline at end of file
+}
@@ -1,5 +1,16 @@
-import React, {useEffect, useMemo, useState} from 'react'
-import {API_BASE_URL, createUser, deleteUser, getMe, listUsers, updateUser, type User, type UserIn} from '../lib/api'
+import React, {useEffect, useMemo, useRef, useState} from 'react'
+import {
+    API_BASE_URL,
+    createUser,
+    deleteUser,
+    getMe,
+    listUsers,
+    subscribeUserEvents,
+    updateUser,
+    type User,
+    type UserIn,
+    type UserSortField
+} from '../lib/api'
 
 function UserForm({initial, onSubmit, onCancel, isEdit = false}: {
     initial?: Partial<UserIn>,
@@ -12,26 +23,32 @@ function UserForm({initial, onSubmit, onCancel, isEdit = false}: {
         birth_year: initial?.birth_year || new Date().getFullYear(),
         gender: (initial?.gender as any) || 'male',
         is_admin: Boolean(initial?.is_admin) || false,
-        avatar_base64: initial?.avatar_base64 ?? null,
+        avatar: null,
         password: initial?.password || '',
     })
 
+    const [previewUrl, setPreviewUrl] = useState<string | null>(null)
+
+    useEffect(() => {
+        if (!form.avatar) {
+            setPreviewUrl(null)
+            return
+        }
+        const url = URL.createObjectURL(form.avatar)
+        setPreviewUrl(url)
+        return () => URL.revokeObjectURL(url)
+    }, [form.avatar])
+
     const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
         const file = e.target.files?.[0]
         if (file) {
-            const reader = new FileReader()
-            reader.onload = (event) => {
-                const result = event.target?.result as string
-                const base64Data = result.split(',')[1]
-                setForm({...form, avatar_base64: base64Data})
-            }
-            reader.readAsDataURL(file)
+            setForm({...form, avatar: file})
         }
     }
 
     const getAvatarUrl = () => {
-        if (form.avatar_base64) {
-            return `data:image/jpeg;base64,${form.avatar_base64}`
+        if (previewUrl) {
+            return previewUrl
         }
         if (isEdit && (initial as any)?.avatar_path) {
             return `${API_BASE_URL}/${(initial as any).avatar_path}`
@@ -110,12 +127,14 @@ export default function UsersPage() {
     const [showAvatarModal, setShowAvatarModal] = useState(false)
     const [selectedAvatar, setSelectedAvatar] = useState<{ src: string, name: string } | null>(null)
 
-    const [sortField, setSortField] = useState<keyof User>('created_at')
+    const [sortField, setSortField] = useState<UserSortField>('created_at')
     const [sortDirection, setSortDirection] = useState<'asc' | 'desc'>('desc')
+    const [nextCursor, setNextCursor] = useState<string | null>(null)
+    const [loadingMore, setLoadingMore] = useState(false)
 
     const isAdmin = useMemo(() => !!me?.is_admin, [me])
 
-    const handleSort = (field: keyof User) => {
+    const handleSort = (field: UserSortField) => {
         if (sortField === field) {
             setSortDirection(sortDirection === 'asc' ? 'desc' : 'asc')
         } else {
@@ -124,57 +143,7 @@ export default function UsersPage() {
         }
     }
 
-    const parseDate = (str: string): Date => {
-        const [datePart, timePart] = str.split(' ');
-        if (!datePart || !timePart) {
-            throw new Error('Неверный формат строки');
-        }
-
-        const [day, month, year] = datePart.split('-').map(Number);
-        const [hours, minutes] = timePart.split(':').map(Number);
-
-        if (
-            isNaN(day) || isNaN(month) || isNaN(year) ||
-            isNaN(hours) || isNaN(minutes)
-        ) {
-            throw new Error('Неверные числовые значения в дате или времени');
-        }
-
-        return new Date(year, month - 1, day, hours, minutes);
-    }
-
-    const sortedUsers = useMemo(() => {
-        return [...users].sort((a, b) => {
-            let aVal = a[sortField]
-            let bVal = b[sortField]
-
-            if (sortField === 'created_at') {
-                aVal = parseDate(aVal as string).getTime()
-                bVal = parseDate(bVal as string).getTime()
-            }
-
-            if (typeof aVal === 'boolean') {
-                aVal = aVal ? 1 : 0
-                bVal = bVal ? 1 : 0
-            }
-
-            if (typeof aVal === 'string' && typeof bVal === 'string') {
-                aVal = aVal.toLowerCase()
-                bVal = bVal.toLowerCase()
-            }
-
-            if (aVal == null && bVal == null) return 0
-
-            if (aVal == null) return sortDirection === 'asc' ? -1 : 1
-            if (bVal == null) return sortDirection === 'asc' ? 1 : -1
-
-            if (aVal < bVal) return sortDirection === 'asc' ? -1 : 1
-            if (aVal > bVal) return sortDirection === 'asc' ? 1 : -1
-            return 0
-        })
-    }, [users, sortField, sortDirection])
-
-    const getSortIcon = (field: keyof User) => {
+    const getSortIcon = (field: UserSortField) => {
         if (sortField !== field) return ' ↕'
         return sortDirection === 'asc' ? ' ↑' : ' ↓'
     }
@@ -189,14 +158,18 @@ export default function UsersPage() {
         }
     }
 
-    async function refetch() {
-        setLoading(true)
+    async function refetch(silent = false) {
+        if (!silent) setLoading(true)
         try {
-            const [meData, usersData] = await Promise.all([getMe().catch(() => null as any), listUsers()])
+            const [meData, page] = await Promise.all([
+                getMe().catch(() => null as any),
+                listUsers({sort: sortField, order: sortDirection}),
+            ])
             if (meData) setMe(meData)
-            const safeUsers = Array.isArray(usersData) ? usersData : []
+            const safeUsers = Array.isArray(page?.items) ? page.items : []
             setUsers(safeUsers)
-            if (!Array.isArray(usersData)) {
+            setNextCursor(page?.next_cursor ?? null)
+            if (!Array.isArray(page?.items)) {
                 setError('Ошибка формата ответа API')
             } else {
                 setError('')
@@ -208,8 +181,37 @@ export default function UsersPage() {
         }
     }
 
+    async function loadMore() {
+        if (!nextCursor) return
+        setLoadingMore(true)
+        try {
+            const page = await listUsers({sort: sortField, order: sortDirection, cursor: nextCursor})
+            setUsers(prev => [...prev, ...page.items])
+            setNextCursor(page.next_cursor)
+        } catch (e) {
+            setError('Не удалось загрузить пользователей')
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
     useEffect(() => {
         refetch()
+    }, [sortField, sortDirection])
+
+    const refetchRef = useRef(refetch)
+    refetchRef.current = refetch
+
+    useEffect(() => {
+        let timer: ReturnType<typeof setTimeout> | undefined
+        const unsubscribe = subscribeUserEvents(() => {
+            clearTimeout(timer)
+            timer = setTimeout(() => refetchRef.current(true), 500)
+        })
+        return () => {
+            clearTimeout(timer)
+            unsubscribe()
+        }
     }, [])
 
     return (
@@ -247,35 +249,20 @@ export default function UsersPage() {
                             >
                                 Год рож.{getSortIcon('birth_year')}
                             </th>
-                            <th
-                                style={{cursor: 'pointer'}}
-                                onClick={() => handleSort('gender')}
-                            >
-                                Пол{getSortIcon('gender')}
-                            </th>
-                            <th
-                                style={{cursor: 'pointer'}}
-                                onClick={() => handleSort('is_admin')}
-                            >
-                                Админ{getSortIcon('is_admin')}
-                            </th>
+                            <th>Пол</th>
+                            <th>Админ</th>
                             <th
                                 style={{cursor: 'pointer'}}
                                 onClick={() => handleSort('created_at')}
                             >
                                 Создан{getSortIcon('created_at')}
                             </th>
-                            <th
-                                style={{cursor: 'pointer'}}
-                                onClick={() => handleSort('created_by' as keyof User)}
-                            >
-                                Кем создан{getSortIcon('created_by' as keyof User)}
-                            </th>
+                            <th>Кем создан</th>
                             <th></th>
                         </tr>
                         </thead>
                         <tbody>
-                        {!loading && sortedUsers.length > 0 && sortedUsers.map(u => (
+                        {!loading && users.length > 0 && users.map(u => (
                             <tr key={u.id}>
                                 <td>
                                     {u.avatar_path ? (
@@ -330,7 +317,7 @@ export default function UsersPage() {
                                 </td>
                             </tr>
                         ))}
-                        {!loading && sortedUsers.length === 0 && (
+                        {!loading && users.length === 0 && (
                             <tr>
                                 <td colSpan={9}>Нет данных</td>
                             </tr>
@@ -342,6 +329,13 @@ export default function UsersPage() {
                         )}
                         </tbody>
                     </table>
+                    {!loading && nextCursor && (
+                        <div className="text-center">
+                            <button className="btn btn-outline-primary" onClick={loadMore} disabled={loadingMore}>
+                                {loadingMore ? 'Загрузка...' : 'Показать ещё'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
 
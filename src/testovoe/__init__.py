@@ -1,3 +1,8 @@
-from .main import create_app
+def __getattr__(name: str):
+    if name == "create_app":
+        from .main.main import create_app
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["create_app"]
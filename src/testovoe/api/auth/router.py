@@ -1,39 +1,37 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.params import Header
 from src.testovoe.exception.token_not_provided import TokenNotProvidedException
 from src.testovoe.main.dependencies import check_auth
 from src.testovoe.model import User
 from src.testovoe.service import AuthService
+from src.testovoe.service.login_throttle import LoginThrottle, get_login_throttle
 
 from .response import UsernamePassword, TokenCreated, APIResponse
 
 auth = APIRouter(prefix="/auth", tags=["auth"])
 auth_service = Annotated[AuthService, Depends()]
+login_throttle = Annotated[LoginThrottle, Depends(get_login_throttle)]
 
 
 @auth.get("/me")
-def get_me(user: check_auth) -> User:
-    if user.created_by:
-        name = user.created_by.name
-    else:
-        name = None
-    user.created_by = None
-    user_app = User.model_validate(user)
-    user_app.created_by = name
-    return user_app
+async def get_me(service: auth_service, user: check_auth) -> User:
+    return await service.get_full_user(user)
 
 
 @auth.post("/login")
-def login(service: auth_service, form: UsernamePassword) -> TokenCreated:
-    token = service.authenticate(form.username, form.password)
+async def login(
+    request: Request, service: auth_service, throttle: login_throttle, form: UsernamePassword
+) -> TokenCreated:
+    throttle.acquire(form.username, request.client.host if request.client else None)
+    token = await service.authenticate(form.username, form.password)
     return TokenCreated(token=token)
 
 
 @auth.post("/logout")
-def logout(service: auth_service, x_token: Annotated[str | None, Header()]) -> APIResponse:
+async def logout(service: auth_service, x_token: Annotated[str | None, Header()]) -> APIResponse:
     if x_token is None:
         raise TokenNotProvidedException()
-    service.logout(x_token)
+    await service.logout(x_token)
     return APIResponse()
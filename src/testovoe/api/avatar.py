@@ -0,0 +1,36 @@
+import os
+import re
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+CONTENT_HASH = re.compile(r"[0-9a-f]{64}")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class AvatarFiles(StaticFiles):
+    def __init__(self, directory: str, accel_redirect: str | None = None):
+        super().__init__(directory=directory)
+        self.accel_redirect = accel_redirect
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        headers = {"Cache-Control": IMMUTABLE}
+        name = os.path.splitext(os.path.basename(full_path))[0]
+        if CONTENT_HASH.fullmatch(name):
+            headers["ETag"] = f'"{name}"'
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        if self.accel_redirect:
+            relative = os.path.relpath(full_path, self.directory)
+            headers["X-Accel-Redirect"] = f"{self.accel_redirect.rstrip('/')}/{relative}"
+            return Response(status_code=status_code, headers=headers, media_type=response.media_type)
+        return response
@@ -0,0 +1,17 @@
+from fastapi.responses import JSONResponse
+from src.testovoe.exception.avatar_too_large import AvatarTooLargeException
+from starlette.requests import Request
+
+from .response import ErrorResponse
+
+
+def avatar_too_large_handler(request: Request, exc: AvatarTooLargeException):
+    return JSONResponse(
+        status_code=413,
+        content=ErrorResponse(
+            error=str(exc),
+            extra_data={
+                "max_size": exc.max_size,
+            }
+        ).model_dump()
+    )
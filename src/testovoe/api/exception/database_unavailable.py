@@ -0,0 +1,17 @@
+from fastapi.responses import JSONResponse
+from src.testovoe.exception.database_unavailable import DatabaseUnavailableException
+from starlette.requests import Request
+
+from .response import ErrorResponse
+
+
+def database_unavailable_handler(request: Request, exc: DatabaseUnavailableException):
+    return JSONResponse(
+        status_code=503,
+        content=ErrorResponse(
+            error=str(exc),
+            extra_data={
+                "pool": exc.pool,
+            }
+        ).model_dump()
+    )
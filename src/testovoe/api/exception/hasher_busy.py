@@ -0,0 +1,18 @@
+from fastapi.responses import JSONResponse
+from src.testovoe.exception.hasher_busy import HasherBusyException
+from starlette.requests import Request
+
+from .response import ErrorResponse
+
+
+def hasher_busy_handler(request: Request, exc: HasherBusyException):
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content=ErrorResponse(
+            error=str(exc),
+            extra_data={
+                "pending": exc.pending,
+            }
+        ).model_dump()
+    )
@@ -0,0 +1,18 @@
+from fastapi.responses import JSONResponse
+from src.testovoe.exception.too_many_login_attempts import TooManyLoginAttemptsException
+from starlette.requests import Request
+
+from .response import ErrorResponse
+
+
+def too_many_login_attempts_handler(request: Request, exc: TooManyLoginAttemptsException):
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": str(exc.retry_after)},
+        content=ErrorResponse(
+            error=str(exc),
+            extra_data={
+                "retry_after": exc.retry_after,
+            }
+        ).model_dump()
+    )
@@ -1,3 +1,4 @@
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from starlette.requests import Request
 from pydantic import ValidationError
@@ -11,7 +12,7 @@ def validation_error_handler(request: Request, exc: ValidationError) -> JSONResp
         content=ErrorResponse(
             error="ValidationError",
             extra_data={
-                "errors": exc.errors()
+                "errors": jsonable_encoder(exc.errors())
             }
         ).model_dump()
     )
@@ -0,0 +1,3 @@
+from .router import health
+
+__all__ = ["health"]
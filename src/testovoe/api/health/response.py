@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class APIResponse(BaseModel):
+    status: bool = Field(default=True)
+
+
+class DbHealth(APIResponse):
+    latency_ms: float
+    pool: dict[str, int]
@@ -0,0 +1,22 @@
+import time
+
+from fastapi import APIRouter
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, TimeoutError
+from src.testovoe.exception.database_unavailable import DatabaseUnavailableException
+from src.testovoe.main.dependencies import AsyncDbSession
+from src.testovoe.main.dependencies.session import get_pool_status
+
+from .response import DbHealth
+
+health = APIRouter(prefix="/health", tags=["health"])
+
+
+@health.get("/db")
+async def db_health(session: AsyncDbSession) -> DbHealth:
+    started = time.perf_counter()
+    try:
+        await session.execute(text("SELECT 1"))
+    except (DBAPIError, TimeoutError) as e:
+        raise DatabaseUnavailableException(str(e).splitlines()[0], get_pool_status())
+    return DbHealth(latency_ms=(time.perf_counter() - started) * 1000, pool=get_pool_status())
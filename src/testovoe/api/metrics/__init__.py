@@ -0,0 +1,4 @@
+from .middleware import MetricsMiddleware
+from .router import metrics
+
+__all__ = ["metrics", "MetricsMiddleware"]
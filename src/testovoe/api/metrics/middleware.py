@@ -0,0 +1,47 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.testovoe.service.metrics import Metrics
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        self.metrics.add("http_requests_in_progress", 1, method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.add("http_requests_in_progress", -1, method=method)
+            self.metrics.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - started,
+                method=method,
+                route=self._route(scope),
+                status=str(status),
+            )
+            self.metrics.schedule_flush()
+
+    @staticmethod
+    def _route(scope: Scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        if "endpoint" in scope:
+            return scope.get("root_path", "")
+        return "unmatched"
@@ -0,0 +1,12 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from src.testovoe.service.metrics import Metrics, get_metrics
+
+metrics = APIRouter(tags=["metrics"])
+
+
+@metrics.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics_text(registry: Annotated[Metrics, Depends(get_metrics)]) -> str:
+    return registry.render()
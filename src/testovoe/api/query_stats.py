@@ -0,0 +1,43 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.testovoe.service.query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp, threshold: int):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Query-Count", str(stats.count))
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", app;dur={total:.1f}',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            for shape, count in stats.repeated(self.threshold):
+                logger.warning(
+                    "%s %s ran the same query %d times (possible N+1): %s",
+                    scope["method"], scope["path"], count, shape[:500],
+                )
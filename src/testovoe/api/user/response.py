@@ -7,3 +7,7 @@ class APIResponse(BaseModel):
 
 class UserCreated(APIResponse):
     user_id: int
+
+
+class UsersAffected(APIResponse):
+    count: int
@@ -1,52 +1,161 @@
 import datetime as dt
-from typing import Annotated, Sequence
+from typing import Annotated
 
-from fastapi import APIRouter, Depends
-from src.testovoe.api.user.response import APIResponse
+from fastapi import APIRouter, Depends, Query, Request, Form
+from fastapi.responses import StreamingResponse
+from src.testovoe.api.user.response import APIResponse, UsersAffected
+from src.testovoe.api.user.upload import AvatarUploadRoute
 from src.testovoe.exception.not_enough_rights_exception import NotEnoughRightsException
 from src.testovoe.main.dependencies import check_auth
-from src.testovoe.model import User, UserIn
+from src.testovoe.model import (
+    UserIn, UserForm, UserCreateForm, UserListQuery, UserPage, UserExportQuery, RegistrationSeriesQuery,
+    RegistrationPoint, UserImportQuery, UserImportResult, UserSelection, UserBulkUpdate
+)
 from src.testovoe.service import UserService
+from src.testovoe.service.events import UserEvents, get_user_events
+from src.testovoe.service.response_cache import ResponseCache, get_response_cache
 
-user = APIRouter(prefix="/user", tags=["user"])
+user = APIRouter(prefix="/user", tags=["user"], route_class=AvatarUploadRoute)
 
 user_service = Annotated[UserService, Depends()]
+response_cache = Annotated[ResponseCache, Depends(get_response_cache)]
+user_events = Annotated[UserEvents, Depends(get_user_events)]
 
 
 @user.get("/")
-def list_users(service: user_service, user: check_auth) -> Sequence[User]:
-    return service.all()
+async def list_users(
+    request: Request,
+    service: user_service,
+    cache: response_cache,
+    query: Annotated[UserListQuery, Query()],
+    user: check_auth,
+) -> UserPage:
+    return await cache.respond(
+        request, lambda: service.all(query), cacheable=service.read_from_primary
+    )
+
+
+@user.get("/export")
+async def export_users(
+    service: user_service, query: Annotated[UserExportQuery, Query()], user: check_auth
+) -> StreamingResponse:
+    media_type = "text/csv" if query.format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        service.export(query, query.format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{query.format}"'},
+    )
+
+
+@user.get("/events")
+async def stream_user_events(events: user_events, user: check_auth) -> StreamingResponse:
+    return StreamingResponse(
+        events.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @user.post("/create")
-def create_user(service: user_service, user_in: UserIn, user: check_auth) -> APIResponse:
+async def create_user(service: user_service, user_in: UserIn, user: check_auth) -> APIResponse:
+    if not user.is_admin:
+        raise NotEnoughRightsException()
+    await service.create(user_in, created_by=user.id)
+    return APIResponse()
+
+
+@user.post("/create/form")
+async def create_user_form(
+    service: user_service, form: Annotated[UserCreateForm, Form()], user: check_auth
+) -> APIResponse:
     if not user.is_admin:
         raise NotEnoughRightsException()
-    service.create(user_in, created_by=user.id)
+    avatar = form.avatar.file if form.avatar is not None else None
+    await service.create(form.to_user_in(), created_by=user.id, avatar=avatar)
     return APIResponse()
 
 
+@user.post("/bulk_create")
+async def bulk_create_users(
+    request: Request, service: user_service, query: Annotated[UserImportQuery, Query()], user: check_auth
+) -> UserImportResult:
+    if not user.is_admin:
+        raise NotEnoughRightsException()
+    return await service.bulk_create(request.stream(), query.format, created_by=user.id)
+
+
 @user.delete("/delete")
-def delete_user(service: user_service, user_id: int, user: check_auth) -> APIResponse:
+async def delete_user(service: user_service, user_id: int, user: check_auth) -> APIResponse:
     if not user.is_admin:
         raise NotEnoughRightsException()
-    service.delete(user_id)
+    await service.delete(user_id)
     return APIResponse()
 
 
+@user.post("/bulk_delete")
+async def bulk_delete_users(service: user_service, selection: UserSelection, user: check_auth) -> UsersAffected:
+    if not user.is_admin:
+        raise NotEnoughRightsException()
+    return UsersAffected(count=await service.bulk_delete(selection, acting_user_id=user.id))
+
+
 @user.patch("/update")
-def update_user(service: user_service, user_id: int, user_in: UserIn, user: check_auth) -> APIResponse:
+async def update_user(service: user_service, user_id: int, user_in: UserIn, user: check_auth) -> APIResponse:
+    if not user.is_admin:
+        raise NotEnoughRightsException()
+    await service.put(user_id, user_in)
+    return APIResponse()
+
+
+@user.patch("/update/form")
+async def update_user_form(
+    service: user_service, user_id: int, form: Annotated[UserForm, Form()], user: check_auth
+) -> APIResponse:
     if not user.is_admin:
         raise NotEnoughRightsException()
-    service.put(user_id, user_in)
+    avatar = form.avatar.file if form.avatar is not None else None
+    await service.put(user_id, form.to_user_in(), avatar=avatar)
     return APIResponse()
 
 
+@user.patch("/bulk_update")
+async def bulk_update_users(service: user_service, bulk: UserBulkUpdate, user: check_auth) -> UsersAffected:
+    if not user.is_admin:
+        raise NotEnoughRightsException()
+    return UsersAffected(count=await service.bulk_update(bulk))
+
+
 @user.get("/group_by_minutes")
-def group_by_minutes(service: user_service, day: dt.date, hour: int, user: check_auth) -> dict[str, int]:
-    return service.group_by_minutes(day, hour)
+async def group_by_minutes(
+    request: Request,
+    service: user_service,
+    cache: response_cache,
+    day: dt.date,
+    hour: Annotated[int, Query(ge=0, le=23)],
+    user: check_auth,
+) -> dict[str, int]:
+    return await cache.respond(
+        request, lambda: service.group_by_minutes(day, hour), cacheable=service.read_from_primary
+    )
 
 
 @user.get("/group_by_hours")
-def group_by_minutes(service: user_service, day: dt.date, user: check_auth) -> dict[str, int]:
-    return service.group_by_hours(day)
+async def group_by_minutes(
+    request: Request, service: user_service, cache: response_cache, day: dt.date, user: check_auth
+) -> dict[str, int]:
+    return await cache.respond(
+        request, lambda: service.group_by_hours(day), cacheable=service.read_from_primary
+    )
+
+
+@user.get("/registrations")
+async def registrations(
+    request: Request,
+    service: user_service,
+    cache: response_cache,
+    query: Annotated[RegistrationSeriesQuery, Query()],
+    user: check_auth,
+) -> list[RegistrationPoint]:
+    return await cache.respond(
+        request, lambda: service.registration_series(query), cacheable=service.read_from_primary
+    )
@@ -0,0 +1,44 @@
+from typing import Any, Callable, Coroutine
+
+from fastapi import params
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Message
+from src.testovoe.exception.avatar_too_large import AvatarTooLargeException
+from src.testovoe.main.dependencies import get_config
+
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class AvatarUploadRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        if self.body_field is None or not isinstance(self.body_field.field_info, params.Form):
+            return handler
+
+        async def limited_handler(request: Request) -> Response:
+            max_size = get_config().avatar_max_size
+            limit = max_size + MULTIPART_OVERHEAD
+            length = request.headers.get("content-length", "")
+            if length.isdigit() and int(length) > limit:
+                raise AvatarTooLargeException(max_size)
+            received = 0
+
+            async def receive() -> Message:
+                nonlocal received
+                message = await request.receive()
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise AvatarTooLargeException(max_size)
+                return message
+
+            try:
+                return await handler(Request(request.scope, receive))
+            except HTTPException as e:
+                if isinstance(e.__cause__, AvatarTooLargeException):
+                    raise e.__cause__
+                raise
+
+        return limited_handler
@@ -1,4 +1,6 @@
+from .registration_stat import RegistrationStat
 from .token import Token
+from .token_revocation import TokenRevocation
 from .user import User
 
-__all__ = ["User", "Token"]
+__all__ = ["User", "Token", "TokenRevocation", "RegistrationStat"]
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy.dialects.postgresql import insert, Insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RegistrationStat(Base):
+    __tablename__ = "registration_stat"
+
+    minute: Mapped[datetime] = mapped_column(primary_key=True)
+    users_created: Mapped[int] = mapped_column(default=0)
+
+    @classmethod
+    def count(cls, deltas: dict[datetime, int]) -> Insert:
+        stmt = insert(cls).values([
+            dict(minute=minute.replace(second=0, microsecond=0), users_created=delta)
+            for minute, delta in deltas.items()
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=[cls.minute],
+            set_={"users_created": cls.users_created + stmt.excluded.users_created},
+        )
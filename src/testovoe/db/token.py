@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from .base import Base
@@ -13,6 +13,11 @@ if TYPE_CHECKING:
 
 class Token(Base):
     __tablename__ = "token"
+    __table_args__ = (
+        Index("ix_token_token", "token", unique=True),
+        Index("ix_token_expires_at", "expires_at"),
+        Index("ix_token_user_id", "user_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"))
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class TokenRevocation(Base):
+    __tablename__ = "token_revocation"
+    __table_args__ = (Index("ix_token_revocation_expires_at", "expires_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    key: Mapped[str]
+    revoked_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    expires_at: Mapped[datetime]
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, CheckConstraint
+from sqlalchemy import ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from .base import Base
@@ -18,6 +18,12 @@ class GenderEnum(StrEnum):
 
 class User(Base):
     __tablename__ = "user"
+    __table_args__ = (
+        Index("ix_user_created_at_id", "created_at", "id"),
+        Index("ix_user_birth_year_id", "birth_year", "id"),
+        Index("ix_user_created_by_id", "created_by_id"),
+        Index("ix_user_avatar_path", "avatar_path"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(unique=True)
@@ -0,0 +1,6 @@
+class AvatarTooLargeException(Exception):
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+
+    def __str__(self):
+        return f"Avatar is larger than {self.max_size} bytes"
@@ -0,0 +1,7 @@
+class DatabaseUnavailableException(Exception):
+    def __init__(self, reason: str, pool: dict[str, int]):
+        self.reason = reason
+        self.pool = pool
+
+    def __str__(self):
+        return f"Database is unavailable: {self.reason}"
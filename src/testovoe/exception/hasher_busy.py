@@ -0,0 +1,6 @@
+class HasherBusyException(Exception):
+    def __init__(self, pending: int):
+        self.pending = pending
+
+    def __str__(self):
+        return f"Password hasher is busy ({self.pending} operations pending), try again later"
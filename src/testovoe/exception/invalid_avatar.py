@@ -0,0 +1,3 @@
+class InvalidAvatarException(Exception):
+    def __str__(self):
+        return "Avatar must be a JPEG, PNG, GIF or WebP image"
@@ -0,0 +1,6 @@
+class InvalidCursorException(Exception):
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+
+    def __str__(self):
+        return f"Invalid cursor {self.cursor}"
@@ -0,0 +1,9 @@
+import math
+
+
+class TooManyLoginAttemptsException(Exception):
+    def __init__(self, retry_after: float):
+        self.retry_after = math.ceil(retry_after)
+
+    def __str__(self):
+        return f"Too many login attempts, try again in {self.retry_after} seconds"
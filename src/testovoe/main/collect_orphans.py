@@ -0,0 +1,25 @@
+import time
+
+from fastapi import BackgroundTasks
+from sqlalchemy import select
+from src.testovoe.db import User
+from src.testovoe.main.dependencies import get_config
+from src.testovoe.main.dependencies.session import new_session
+from src.testovoe.service.file import FileService
+from src.testovoe.service.metrics import get_metrics
+
+BATCH_SIZE = 1000
+
+session = next(new_session())
+config = get_config()
+file_service = FileService(config, BackgroundTasks(), get_metrics())
+while True:
+    for batch in file_service.orphan_candidates(BATCH_SIZE):
+        referenced = set(session.scalars(select(User.avatar_path).where(User.avatar_path.in_(batch))))
+        session.rollback()
+        for path in batch:
+            if path not in referenced:
+                file_service.delete_orphan(path)
+    if config.avatar_gc_interval <= 0:
+        break
+    time.sleep(config.avatar_gc_interval)
@@ -1,5 +1,7 @@
-from pydantic import DirectoryPath
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Annotated, Literal
+
+from pydantic import DirectoryPath, Field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict, NoDecode
 
 
 class Config(BaseSettings):
@@ -9,5 +11,48 @@ class Config(BaseSettings):
     root_password: str
     nginx_proxy_prefix: str
     static_files: str
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout: int = 0
+    db_replica_uris: Annotated[list[str], NoDecode] = []
+    db_replica_retry: float = 30
+    avatar_max_size: int = 5 * 1024 * 1024
+    tz: str = "UTC"
+    token_cache_size: int = 10000
+    token_cache_ttl: int = 30
+    hasher_workers: int = 0
+    hasher_max_pending: int = 64
+    data_version_file: str = "/tmp/testovoe-data-version"
+    response_cache_size: int = 256
+    avatar_accel_redirect: str | None = None
+    avatar_gc_grace: int = 600
+    avatar_gc_interval: int = 0
+    token_mode: Literal["db", "signed"] = "db"
+    token_secret: str = ""
+    token_ttl: int = 30 * 24 * 3600
+    token_revocation_refresh: float = 5
+    token_sweep_interval: int = 0
+    token_sweep_batch: int = 1000
+    metrics_dir: str = "/tmp/testovoe-metrics"
+    n_plus_one_threshold: int = 5
+    events_queue_size: int = 100
+    events_heartbeat: float = 15
+    events_retry: float = 5
+    login_throttle_file: str = "/tmp/testovoe-login-throttle"
+    login_throttle_slots: Annotated[int, Field(gt=0)] = 65536
+    login_user_burst: int = 5
+    login_user_rate: Annotated[float, Field(gt=0)] = 0.1
+    login_client_burst: int = 0
+    login_client_rate: Annotated[float, Field(gt=0)] = 1
+
+    @field_validator("db_replica_uris", mode="before")
+    @classmethod
+    def split_replica_uris(cls, v):
+        if isinstance(v, str):
+            return [uri.strip() for uri in v.split(",") if uri.strip()]
+        return v
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
@@ -1,15 +1,19 @@
+import datetime as dt
+
 from passlib.context import CryptContext
 from sqlalchemy import select
-from src.testovoe.db import User
+from src.testovoe.db import User, RegistrationStat
 from src.testovoe.db.user import GenderEnum
 from src.testovoe.main.dependencies import get_config
 from src.testovoe.main.dependencies.session import new_session
+from src.testovoe.service.data_version import get_data_version
 
 session = next(new_session())
 config = get_config()
 ctx = CryptContext(schemes=["bcrypt"])
 exists = session.scalars(select(User).where(User.name == config.root_username)).one_or_none()
 if not exists:
+    created_at = dt.datetime.now()
     session.add(
         User(
             name=config.root_username,
@@ -17,6 +21,9 @@ if not exists:
             birth_year=2006,
             is_admin=True,
             password=ctx.hash(config.root_password),
+            created_at=created_at,
         )
     )
+    session.execute(RegistrationStat.count({created_at: 1}))
     session.commit()
+    get_data_version().bump()
@@ -1,5 +1,19 @@
+import importlib
+
 from .config import get_config
-from .session import DbSession
-from .auth import check_auth
 
-__all__ = ["get_config", "DbSession", "check_auth"]
+_LAZY = {
+    "DbSession": ".db",
+    "AsyncDbSession": ".db",
+    "ReadDbSession": ".db",
+    "check_auth": ".auth",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["get_config", "DbSession", "AsyncDbSession", "ReadDbSession", "check_auth"]
@@ -1,15 +1,17 @@
 from typing import Annotated
 
 from fastapi import Depends, Header
-from src.testovoe.db import User
+from src.testovoe.model import User, AuthUser
 from src.testovoe.exception.token_not_provided import TokenNotProvidedException
 from src.testovoe.service import AuthService
 
 
-def check_auth_(service: Annotated[AuthService, Depends()], x_token: Annotated[str | None, Header()] = None) -> User:
+async def check_auth_(
+    service: Annotated[AuthService, Depends()], x_token: Annotated[str | None, Header()] = None
+) -> User | AuthUser:
     if x_token is None:
         raise TokenNotProvidedException(x_token)
-    return service.get_user_by_token(x_token)
+    return await service.get_user_by_token(x_token)
 
 
-check_auth = Annotated[User, Depends(check_auth_)]
+check_auth = Annotated[User | AuthUser, Depends(check_auth_)]
@@ -0,0 +1,21 @@
+from typing import Annotated, AsyncIterable
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .session import ReadSession, new_session, new_async_session, get_replica_set
+
+DbSession = Annotated[Session, Depends(new_session)]
+AsyncDbSession = Annotated[AsyncSession, Depends(new_async_session)]
+
+
+async def new_read_session(primary: AsyncDbSession) -> AsyncIterable[ReadSession]:
+    session = ReadSession(primary, get_replica_set())
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+ReadDbSession = Annotated[ReadSession, Depends(new_read_session)]
@@ -1,27 +1,207 @@
-from typing import Iterable, Annotated
+import itertools
+import os
+import threading
+import time
+from functools import lru_cache, partial
+from typing import Iterable, AsyncIterable
 
-from fastapi import Depends
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker, Session
 
 from .config import get_config
 
 
-def create_session_maker():
+def get_db_uri() -> str:
     db_uri = get_config().db_uri
     if not db_uri:
         raise ValueError("DB_URI env variable is not set")
+    return db_uri
+
+
+def get_engine_options() -> dict:
+    cfg = get_config()
+    options = dict(
+        pool_size=cfg.db_pool_size,
+        max_overflow=cfg.db_max_overflow,
+        pool_timeout=cfg.db_pool_timeout,
+        pool_recycle=cfg.db_pool_recycle,
+        pool_pre_ping=cfg.db_pool_pre_ping,
+    )
+    if cfg.db_statement_timeout > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={cfg.db_statement_timeout}"}
+    return options
+
 
-    engine = create_engine(db_uri)
+def create_session_maker():
+    engine = create_engine(get_db_uri(), **get_engine_options())
     return sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 
-session_maker = create_session_maker()
+def create_async_session_maker(db_uri: str | None = None):
+    engine = create_async_engine(db_uri or get_db_uri(), **get_engine_options())
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+class ReplicaSet:
+    def __init__(self, session_makers: list[async_sessionmaker[AsyncSession]], retry_after: float):
+        self.session_makers = session_makers
+        self.retry_after = retry_after
+        self._next = itertools.count()
+        self._down_until: dict[int, float] = {}
+        for index, session_maker in enumerate(session_makers):
+            event.listen(session_maker.kw["bind"].sync_engine, "handle_error", partial(self._on_error, index))
+
+    def choose(self) -> async_sessionmaker[AsyncSession] | None:
+        now = time.monotonic()
+        for _ in range(len(self.session_makers)):
+            index = next(self._next) % len(self.session_makers)
+            if self._down_until.get(index, 0) <= now:
+                return self.session_makers[index]
+        return None
+
+    def _on_error(self, index: int, context) -> None:
+        if context.is_disconnect or context.connection is None:
+            self._down_until[index] = time.monotonic() + self.retry_after
+
+
+class ReadSession:
+    def __init__(self, primary: AsyncSession, replicas: ReplicaSet):
+        self.primary = primary
+        self.replicas = replicas
+        self._replica: AsyncSession | None = None
+        self._use_primary = False
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._use_primary or self.primary.info.get("wrote"):
+            return self.primary
+        if self._replica is None:
+            session_maker = self.replicas.choose()
+            if session_maker is None:
+                return self.primary
+            self._replica = session_maker()
+        return self._replica
+
+    @property
+    def on_replica(self) -> bool:
+        return self.session is not self.primary
+
+    def use_primary(self) -> None:
+        self._use_primary = True
+
+    async def execute(self, *args, **kwargs):
+        return await self._call("execute", *args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        return await self._call("scalars", *args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return await self._call("scalar", *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await self._call("get", *args, **kwargs)
+
+    async def close(self) -> None:
+        if self._replica is not None:
+            await self._replica.close()
+
+    async def _call(self, method: str, *args, **kwargs):
+        session = self.session
+        try:
+            return await getattr(session, method)(*args, **kwargs)
+        except OperationalError:
+            if session is self.primary:
+                raise
+            await self._replica.close()
+            self.use_primary()
+            return await getattr(self.primary, method)(*args, **kwargs)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_session_maker() -> sessionmaker[Session]:
+    return create_session_maker()
+
+
+@lru_cache
+def _create_async_session_maker() -> async_sessionmaker[AsyncSession]:
+    return create_async_session_maker()
+
+
+@lru_cache
+def _create_replica_set() -> ReplicaSet:
+    cfg = get_config()
+    return ReplicaSet([create_async_session_maker(uri) for uri in cfg.db_replica_uris], cfg.db_replica_retry)
+
+
+def get_session_maker() -> sessionmaker[Session]:
+    with _lock:
+        return _create_session_maker()
+
+
+def get_async_session_maker() -> async_sessionmaker[AsyncSession]:
+    with _lock:
+        return _create_async_session_maker()
+
+
+def get_replica_set() -> ReplicaSet:
+    with _lock:
+        return _create_replica_set()
+
+
+def get_read_session_maker() -> async_sessionmaker[AsyncSession]:
+    return get_replica_set().choose() or get_async_session_maker()
+
+
+def get_async_engine() -> AsyncEngine:
+    return get_async_session_maker().kw["bind"]
+
+
+def get_pool_status() -> dict[str, int]:
+    if not _create_async_session_maker.cache_info().currsize:
+        return {}
+    pool = get_async_engine().pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+def _dispose_after_fork() -> None:
+    if _create_session_maker.cache_info().currsize:
+        _create_session_maker().kw["bind"].dispose(close=False)
+    if _create_async_session_maker.cache_info().currsize:
+        _create_async_session_maker().kw["bind"].sync_engine.dispose(close=False)
+    if _create_replica_set.cache_info().currsize:
+        for session_maker in _create_replica_set().session_makers:
+            session_maker.kw["bind"].sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_after_fork)
 
 
 def new_session() -> Iterable[Session]:
-    with session_maker() as session:
+    with get_session_maker()() as session:
         yield session
 
 
-DbSession = Annotated[Session, Depends(new_session)]
+async def new_async_session() -> AsyncIterable[AsyncSession]:
+    async with get_async_session_maker()() as session:
+        yield session
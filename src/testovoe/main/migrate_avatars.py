@@ -0,0 +1,40 @@
+import os
+
+from fastapi import BackgroundTasks
+from sqlalchemy import select
+from src.testovoe.db import User
+from src.testovoe.exception.avatar_too_large import AvatarTooLargeException
+from src.testovoe.exception.invalid_avatar import InvalidAvatarException
+from src.testovoe.main.dependencies import get_config
+from src.testovoe.main.dependencies.session import new_session
+from src.testovoe.service.data_version import get_data_version
+from src.testovoe.service.file import FileService
+from src.testovoe.service.metrics import get_metrics
+
+BATCH_SIZE = 500
+
+session = next(new_session())
+file_service = FileService(get_config(), BackgroundTasks(), get_metrics())
+stale = set()
+users = session.execute(
+    select(User.id, User.avatar_path).where(User.avatar_path.is_not(None)).order_by(User.id)
+).all()
+for i, (user_id, avatar_path) in enumerate(users, 1):
+    if not os.path.isfile(avatar_path):
+        continue
+    try:
+        with open(avatar_path, "rb") as f:
+            new_path = file_service.save_stream(f)
+    except (InvalidAvatarException, AvatarTooLargeException):
+        continue
+    if new_path != avatar_path:
+        session.get(User, user_id).avatar_path = new_path
+        stale.add(avatar_path)
+    if i % BATCH_SIZE == 0:
+        session.commit()
+session.commit()
+if stale:
+    get_data_version().bump()
+referenced = set(session.scalars(select(User.avatar_path).where(User.avatar_path.in_(stale))))
+for path in stale - referenced:
+    file_service.delete_file(path)
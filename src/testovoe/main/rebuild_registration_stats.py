@@ -0,0 +1,16 @@
+from sqlalchemy import delete, func, insert, select
+from src.testovoe.db import RegistrationStat, User
+from src.testovoe.main.dependencies.session import new_session
+from src.testovoe.service.data_version import get_data_version
+
+session = next(new_session())
+minute = func.date_trunc("minute", User.created_at)
+session.execute(delete(RegistrationStat))
+session.execute(
+    insert(RegistrationStat).from_select(
+        ["minute", "users_created"],
+        select(minute, func.count(User.id)).group_by(minute),
+    )
+)
+session.commit()
+get_data_version().bump()
@@ -1,37 +1,67 @@
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
-from fastapi.staticfiles import StaticFiles
+from sqlalchemy.engine import Engine
 from pydantic import ValidationError
 from starlette.middleware.cors import CORSMiddleware
 
 from src.testovoe.api import auth, user
+from src.testovoe.api.avatar import AvatarFiles
+from src.testovoe.api.health import health
+from src.testovoe.api.metrics import metrics, MetricsMiddleware
+from src.testovoe.api.query_stats import QueryStatsMiddleware
 from src.testovoe.api.exception.auth import auth_error_handler
+from src.testovoe.api.exception.avatar_too_large import avatar_too_large_handler
+from src.testovoe.api.exception.database_unavailable import database_unavailable_handler
 from src.testovoe.api.exception.default import base_error_handler
+from src.testovoe.api.exception.hasher_busy import hasher_busy_handler
 from src.testovoe.api.exception.password import incorrect_password_handler
+from src.testovoe.api.exception.too_many_login_attempts import too_many_login_attempts_handler
 from src.testovoe.api.exception.user_not_found import user_not_found_handler
 from src.testovoe.api.exception.validation import validation_error_handler
 from src.testovoe.exception import UserNotFoundException, UsernameOrPasswordIncorrectException
+from src.testovoe.exception.avatar_too_large import AvatarTooLargeException
+from src.testovoe.exception.database_unavailable import DatabaseUnavailableException
+from src.testovoe.exception.hasher_busy import HasherBusyException
+from src.testovoe.exception.invalid_avatar import InvalidAvatarException
+from src.testovoe.exception.invalid_cursor import InvalidCursorException
 from src.testovoe.exception.invalid_token import InvalidTokenException
 from src.testovoe.exception.not_enough_rights_exception import NotEnoughRightsException
 from src.testovoe.exception.token_expired import TokenExpiredException
 from src.testovoe.exception.token_not_provided import TokenNotProvidedException
+from src.testovoe.exception.too_many_login_attempts import TooManyLoginAttemptsException
 from src.testovoe.main.dependencies import get_config
+from src.testovoe.main.dependencies.session import get_pool_status
+from src.testovoe.service.events import get_user_events
+from src.testovoe.service.metrics import get_metrics
+from src.testovoe.service.query_stats import instrument_engine
+from src.testovoe.service.token_cache import get_token_cache
 
 
 def init_routers(app: FastAPI):
     cfg = get_config()
     if cfg.static_files == "internal":
         upload_dir = get_config().upload_dir
-        static = StaticFiles(directory=upload_dir)
+        static = AvatarFiles(directory=upload_dir, accel_redirect=cfg.avatar_accel_redirect)
         app.mount(f"/{upload_dir}", static)
     app.include_router(user)
     app.include_router(auth)
+    app.include_router(metrics)
+    app.include_router(health)
+    registry = get_metrics()
+    registry.instrument_engine(Engine)
+    registry.collect_gauges(lambda: [(f"db_pool_{key}", {}, value) for key, value in get_pool_status().items()])
+    registry.collect_gauges(lambda: [("sse_subscribers", {}, get_user_events().subscribers)])
+    registry.collect_gauges(lambda: [("token_cache_size", {}, get_token_cache().size)])
+    instrument_engine(Engine)
+    app.add_middleware(QueryStatsMiddleware, threshold=cfg.n_plus_one_threshold)
+    app.add_middleware(MetricsMiddleware, metrics=registry)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Query-Count", "Server-Timing"],
     )
     app.add_exception_handler(UserNotFoundException, user_not_found_handler)
     app.add_exception_handler(UsernameOrPasswordIncorrectException, incorrect_password_handler)
@@ -39,6 +69,12 @@ def init_routers(app: FastAPI):
     app.add_exception_handler(TokenExpiredException, auth_error_handler)
     app.add_exception_handler(TokenNotProvidedException, auth_error_handler)
     app.add_exception_handler(NotEnoughRightsException, auth_error_handler)
+    app.add_exception_handler(HasherBusyException, hasher_busy_handler)
+    app.add_exception_handler(TooManyLoginAttemptsException, too_many_login_attempts_handler)
+    app.add_exception_handler(InvalidCursorException, base_error_handler)
+    app.add_exception_handler(InvalidAvatarException, base_error_handler)
+    app.add_exception_handler(AvatarTooLargeException, avatar_too_large_handler)
+    app.add_exception_handler(DatabaseUnavailableException, database_unavailable_handler)
     app.add_exception_handler(ValidationError, validation_error_handler)
     app.add_exception_handler(RequestValidationError, validation_error_handler)
     app.add_exception_handler(Exception, base_error_handler)
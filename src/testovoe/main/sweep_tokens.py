@@ -0,0 +1,26 @@
+import datetime as dt
+import time
+
+from sqlalchemy import delete, select
+from src.testovoe.db import Token, TokenRevocation
+from src.testovoe.main.dependencies import get_config
+from src.testovoe.main.dependencies.session import new_session
+
+session = next(new_session())
+config = get_config()
+while True:
+    for model in (Token, TokenRevocation):
+        while True:
+            expired = (
+                select(model.id)
+                .where(model.expires_at < dt.datetime.now())
+                .limit(config.token_sweep_batch)
+                .with_for_update(skip_locked=True)
+            )
+            deleted = session.execute(delete(model).where(model.id.in_(expired.scalar_subquery()))).rowcount
+            session.commit()
+            if deleted < config.token_sweep_batch:
+                break
+    if config.token_sweep_interval <= 0:
+        break
+    time.sleep(config.token_sweep_interval)
@@ -1,3 +1,27 @@
-from .user import UserIn, User, UserPatch
+from .registration import RegistrationSeriesQuery, RegistrationPoint
+from .user import AuthUser, UserIn, UserForm, UserCreateForm, User, UserPatch, UserFilter, UserListQuery
+from .user import UserExportQuery, UserPage
+from .user import UserImport, UserImportQuery, UserImportError, UserImportResult
+from .user import UserSelection, UserBulkPatch, UserBulkUpdate
 
-__all__ = ["User", "UserIn", "UserPatch"]
+__all__ = [
+    "User",
+    "AuthUser",
+    "UserIn",
+    "UserForm",
+    "UserCreateForm",
+    "UserPatch",
+    "UserFilter",
+    "UserListQuery",
+    "UserExportQuery",
+    "UserPage",
+    "UserImport",
+    "UserImportQuery",
+    "UserImportError",
+    "UserImportResult",
+    "UserSelection",
+    "UserBulkPatch",
+    "UserBulkUpdate",
+    "RegistrationSeriesQuery",
+    "RegistrationPoint",
+]
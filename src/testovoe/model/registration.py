@@ -0,0 +1,50 @@
+import datetime as dt
+from typing import Annotated, Literal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+BUCKET_STEPS = {
+    "minute": dt.timedelta(minutes=1),
+    "hour": dt.timedelta(hours=1),
+    "day": dt.timedelta(days=1),
+    "week": dt.timedelta(weeks=1),
+    "month": dt.timedelta(days=28),
+}
+MAX_BUCKETS = 5000
+
+
+class RegistrationSeriesQuery(BaseModel):
+    from_: Annotated[dt.datetime, Field(alias="from")]
+    to: dt.datetime
+    bucket: Literal["minute", "hour", "day", "week", "month"] = "hour"
+    tz: str = "UTC"
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @field_validator("tz")
+    @classmethod
+    def check_tz(cls, v: str) -> str:
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone {v}")
+        return v
+
+    @model_validator(mode="after")
+    def check_range(self) -> "RegistrationSeriesQuery":
+        zone = ZoneInfo(self.tz)
+        if self.from_.tzinfo is None:
+            self.from_ = self.from_.replace(tzinfo=zone)
+        if self.to.tzinfo is None:
+            self.to = self.to.replace(tzinfo=zone)
+        if self.to <= self.from_:
+            raise ValueError("'to' must be later than 'from'")
+        if (self.to - self.from_) / BUCKET_STEPS[self.bucket] > MAX_BUCKETS:
+            raise ValueError(f"Range contains more than {MAX_BUCKETS} buckets, use a larger bucket")
+        return self
+
+
+class RegistrationPoint(BaseModel):
+    start: dt.datetime
+    count: int
@@ -1,8 +1,9 @@
 import datetime as dt
-from typing import Optional
+from typing import Optional, Literal
 
-from pydantic import BaseModel, ConfigDict, field_serializer, Field
-from src.testovoe.db.user import GenderEnum
+from fastapi import UploadFile
+from pydantic import BaseModel, ConfigDict, field_serializer, Field, model_validator
+from src.testovoe.db.user import GenderEnum, User as UserDB
 
 
 class UserBase(BaseModel):
@@ -17,6 +18,23 @@ class UserIn(UserBase):
     password: str
 
 
+class UserForm(UserBase):
+    password: str = ""
+    avatar: Optional[UploadFile] = None
+
+    def to_user_in(self) -> UserIn:
+        return UserIn(**self.model_dump(exclude={"avatar"}), avatar_base64=None)
+
+
+class UserCreateForm(UserForm):
+    password: str = Field(min_length=1)
+
+
+class AuthUser(BaseModel):
+    id: int
+    is_admin: bool
+
+
 class User(UserBase):
     id: int
     created_at: dt.datetime
@@ -29,6 +47,19 @@ class User(UserBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def from_db(cls, user: UserDB) -> "User":
+        return cls(
+            id=user.id,
+            name=user.name,
+            birth_year=user.birth_year,
+            gender=user.gender,
+            is_admin=user.is_admin,
+            created_at=user.created_at,
+            created_by=user.created_by.name if user.created_by is not None else None,
+            avatar_path=user.avatar_path,
+        )
+
 
 class UserPatch(BaseModel):
     name: Optional[str] = None
@@ -37,3 +68,70 @@ class UserPatch(BaseModel):
     avatar_base64: Optional[str] = None
     is_admin: Optional[bool] = None
     password: Optional[str] = None
+
+
+class UserFilter(BaseModel):
+    gender: Optional[GenderEnum] = None
+    is_admin: Optional[bool] = None
+    birth_year_from: Optional[int] = None
+    birth_year_to: Optional[int] = None
+    created_by: Optional[int] = None
+    sort: Literal["created_at", "id", "name", "birth_year"] = "created_at"
+    order: Literal["asc", "desc"] = "desc"
+
+
+class UserListQuery(UserFilter):
+    limit: int = Field(default=100, ge=1, le=500)
+    cursor: Optional[str] = None
+
+
+class UserExportQuery(UserFilter):
+    format: Literal["ndjson", "csv"] = "ndjson"
+
+
+class UserImport(UserBase):
+    password: str
+    avatar_base64: Optional[str] = None
+
+
+class UserImportQuery(BaseModel):
+    format: Literal["ndjson", "csv"] = "ndjson"
+
+
+class UserImportError(BaseModel):
+    row: int
+    error: str
+
+
+class UserImportResult(BaseModel):
+    created: int = 0
+    errors: list[UserImportError] = []
+
+
+class UserSelection(BaseModel):
+    ids: Optional[list[int]] = None
+    filter: Optional[UserFilter] = None
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        restricted = self.filter is not None and self.filter.model_dump(exclude={"sort", "order"}, exclude_none=True)
+        if self.ids is None and not restricted:
+            raise ValueError("Either ids or a non-empty filter must be provided")
+        return self
+
+
+class UserBulkPatch(BaseModel):
+    birth_year: Optional[int] = Field(default=None, ge=1900, le=2025)
+    gender: Optional[GenderEnum] = None
+    avatar_base64: Optional[str] = None
+    is_admin: Optional[bool] = None
+    password: Optional[str] = None
+
+
+class UserBulkUpdate(UserSelection):
+    data: UserBulkPatch
+
+
+class UserPage(BaseModel):
+    items: list[User]
+    next_cursor: Optional[str] = None
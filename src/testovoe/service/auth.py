@@ -1,46 +1,118 @@
 import datetime as dt
+from typing import Annotated
 
-from passlib.context import CryptContext
+from fastapi import Depends
 from sqlalchemy import select
-from src.testovoe.db import User, Token
+from sqlalchemy.orm import joinedload
+from src.testovoe.db import User as UserDB, Token, TokenRevocation
+from src.testovoe.exception import UserNotFoundException
 from src.testovoe.exception.invalid_token import InvalidTokenException
-from src.testovoe.exception.token_expired import TokenExpiredException
 from src.testovoe.exception.username_or_password_incorrect import UsernameOrPasswordIncorrectException
-from src.testovoe.main.dependencies import DbSession
+from src.testovoe.main.dependencies import AsyncDbSession, ReadDbSession
+from src.testovoe.model import User, AuthUser
+from src.testovoe.service.hasher import PasswordHasher, get_hasher
+from src.testovoe.service.revocation import RevocationList, get_revocation_list
+from src.testovoe.service.token_cache import TokenCache, get_token_cache
+from src.testovoe.service.token_signer import TokenSigner, get_token_signer, SIGNED_TOKEN_PREFIX
 
 
 class AuthService:
-    def __init__(self, session: DbSession):
+    def __init__(
+        self,
+        session: AsyncDbSession,
+        read_session: ReadDbSession,
+        cache: Annotated[TokenCache, Depends(get_token_cache)],
+        hasher: Annotated[PasswordHasher, Depends(get_hasher)],
+        signer: Annotated[TokenSigner | None, Depends(get_token_signer)],
+        revocations: Annotated[RevocationList, Depends(get_revocation_list)],
+    ):
         self.session = session
-        self.pwd_context = CryptContext(schemes=["bcrypt"])
+        self.read_session = read_session
+        self.cache = cache
+        self.hasher = hasher
+        self.signer = signer
+        self.revocations = revocations
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.hasher.verify(plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        return await self.hasher.hash(password)
 
-    def authenticate(self, name: str, password: str) -> str:
-        user = self.session.scalars(select(User).where(User.name == name)).one_or_none()
+    async def get_password_hashes(self, passwords: list[str]) -> list[str]:
+        return await self.hasher.hash_many(passwords)
+
+    async def authenticate(self, name: str, password: str) -> str:
+        user = (await self.session.scalars(select(UserDB).where(UserDB.name == name))).one_or_none()
         if user is None:
+            await self.hasher.verify_dummy(password)
             raise UsernameOrPasswordIncorrectException(name, password)
-        if not self.verify_password(password, user.password):
+        if not await self.verify_password(password, user.password):
             raise UsernameOrPasswordIncorrectException(name, password)
+        if self.signer is not None:
+            token, _ = self.signer.sign(user.id, user.is_admin)
+            return token
         token = Token(user_id=user.id)
         self.session.add(token)
-        self.session.commit()
+        await self.session.commit()
         return str(token.token)
 
-    def logout(self, token: str) -> None:
-        token = self.session.scalars(select(Token).where(Token.token == token)).one_or_none()
+    async def logout(self, token: str) -> None:
+        if token.startswith(SIGNED_TOKEN_PREFIX):
+            claims = self.signer.verify(token) if self.signer is not None else None
+            if claims is not None:
+                self.session.add(TokenRevocation(
+                    key=self.revocations.token_key(claims.jti),
+                    expires_at=dt.datetime.fromtimestamp(claims.exp),
+                ))
+                await self.session.commit()
+                self.revocations.add_token(claims.jti)
+            return
+        self.cache.invalidate_token(token)
+        token = (await self.session.scalars(select(Token).where(Token.token == token))).one_or_none()
         if token is not None:
-            self.session.delete(token)
-            self.session.commit()
+            await self.session.delete(token)
+            await self.session.commit()
+
+    async def revoke_users(self, user_ids: list[int]) -> None:
+        if self.signer is None:
+            return
+        now = dt.datetime.now()
+        expires_at = now + dt.timedelta(seconds=self.signer.ttl)
+        for user_id in user_ids:
+            self.session.add(TokenRevocation(key=self.revocations.user_key(user_id), revoked_at=now, expires_at=expires_at))
+            self.revocations.add_user(user_id, now)
+
+    async def get_full_user(self, user: User | AuthUser) -> User:
+        if isinstance(user, User):
+            return user
+        user_db = await self.read_session.get(UserDB, user.id, options=[joinedload(UserDB.created_by)])
+        if user_db is None:
+            raise UserNotFoundException(user.id)
+        return User.from_db(user_db)
 
-    def get_user_by_token(self, token: str) -> User:
-        token = self.session.scalars(select(Token).where(Token.token == token)).one_or_none()
-        if not token:
+    async def get_user_by_token(self, token: str) -> User | AuthUser:
+        if token.startswith(SIGNED_TOKEN_PREFIX):
+            claims = self.signer.verify(token) if self.signer is not None else None
+            if claims is None or await self.revocations.is_revoked(claims):
+                raise InvalidTokenException(token)
+            return AuthUser(id=claims.uid, is_admin=claims.adm)
+        user = self.cache.get(token)
+        if user is not None:
+            return user
+        stmt = (
+            select(UserDB, Token.expires_at)
+            .join(Token, Token.user_id == UserDB.id)
+            .where(Token.token == token, Token.expires_at > dt.datetime.now())
+            .options(joinedload(UserDB.created_by))
+        )
+        row = (await self.read_session.execute(stmt)).one_or_none()
+        if row is None and self.read_session.on_replica:
+            self.read_session.use_primary()
+            row = (await self.read_session.execute(stmt)).one_or_none()
+        if row is None:
             raise InvalidTokenException(token)
-        if token.expires_at < dt.datetime.now():
-            raise TokenExpiredException(token)
-        return self.session.get(User, token.user_id)
+        user_db, expires_at = row
+        user = User.from_db(user_db)
+        self.cache.put(token, user, expires_at)
+        return user
@@ -0,0 +1,50 @@
+import fcntl
+import os
+import threading
+from functools import lru_cache
+
+from src.testovoe.main.dependencies import get_config
+
+
+class DataVersion:
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: int | None = None
+
+    def get(self) -> int:
+        return int.from_bytes(os.pread(self._open(), 8, 0), "big")
+
+    def bump(self) -> int:
+        fd = self._open()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            version = (int.from_bytes(os.pread(fd, 8, 0), "big") + 1) % 2 ** 64
+            os.pwrite(fd, version.to_bytes(8, "big"), 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        return version
+
+    def _open(self) -> int:
+        if self._fd is None:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if len(os.pread(fd, 8, 0)) < 8:
+                    os.pwrite(fd, os.urandom(8), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._fd = fd
+        return self._fd
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_data_version() -> DataVersion:
+    return DataVersion(get_config().data_version_file)
+
+
+def get_data_version() -> DataVersion:
+    with _lock:
+        return _create_data_version()
@@ -0,0 +1,133 @@
+import asyncio
+import datetime as dt
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator
+
+import psycopg
+from sqlalchemy import select, func, bindparam, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.testovoe.main.dependencies import get_config
+
+EVENTS_CHANNEL = "user_events"
+NOTIFY_MAX_BYTES = 7000
+RESYNC = json.dumps({"type": "resync", "ids": [], "registrations": {}})
+
+logger = logging.getLogger(__name__)
+
+
+class UserEvents:
+    def __init__(self, dsn: str, queue_size: int, heartbeat: float, retry: float):
+        self.dsn = dsn
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.retry = retry
+        self._subscribers: set[asyncio.Queue[str]] = set()
+        self._listener: asyncio.Task | None = None
+
+    @staticmethod
+    async def publish(
+        session: AsyncSession, event: str, ids: list[int], registrations: dict[dt.datetime, int] | None = None
+    ) -> None:
+        minutes = {minute.isoformat(): delta for minute, delta in (registrations or {}).items() if delta}
+        payloads = UserEvents._payloads(event, ids, minutes)
+        unnest = func.unnest(bindparam("payloads", payloads, type_=ARRAY(Text)))
+        payload = unnest.table_valued("payload").render_derived()
+        await session.execute(select(func.pg_notify(EVENTS_CHANNEL, payload.c.payload)))
+
+    @staticmethod
+    def _payloads(event: str, ids: list[int], minutes: dict[str, int]) -> list[str]:
+        payloads = []
+        batch = {"type": event, "ids": [], "registrations": {}}
+        empty = size = len(json.dumps(batch).encode())
+        entries = [("ids", id_, None) for id_ in ids]
+        entries += [("registrations", key, value) for key, value in minutes.items()]
+        for field, key, value in entries:
+            if field == "ids":
+                cost = len(json.dumps(key).encode()) + 2
+            else:
+                cost = len(json.dumps({key: value}).encode())
+            if size + cost > NOTIFY_MAX_BYTES and size > empty:
+                payloads.append(json.dumps(batch))
+                batch = {"type": event, "ids": [], "registrations": {}}
+                size = empty
+            if field == "ids":
+                batch["ids"].append(key)
+            else:
+                batch["registrations"][key] = value
+            size += cost
+        payloads.append(json.dumps(batch))
+        return payloads
+
+    async def stream(self) -> AsyncIterator[str]:
+        async with self.subscribe() as queue:
+            yield f"retry: {int(self.retry * 1000)}\n\n"
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), self.heartbeat)
+                except TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"data: {payload}\n\n"
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[str]]:
+        queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+            if not self._subscribers and self._listener is not None:
+                self._listener.cancel()
+                self._listener = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def _listen(self) -> None:
+        connected = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self.dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {EVENTS_CHANNEL}")
+                    if connected:
+                        self._broadcast(RESYNC)
+                    connected = True
+                    async for notify in conn.notifies():
+                        self._broadcast(notify.payload)
+            except Exception:
+                logger.exception("Event listener failed, reconnecting in %ss", self.retry)
+                await asyncio.sleep(self.retry)
+
+    def _broadcast(self, payload: str) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+            else:
+                queue.put_nowait(payload)
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_user_events() -> UserEvents:
+    config = get_config()
+    dsn = make_url(config.db_uri).set(drivername="postgresql").render_as_string(hide_password=False)
+    return UserEvents(dsn, config.events_queue_size, config.events_heartbeat, config.events_retry)
+
+
+def get_user_events() -> UserEvents:
+    with _lock:
+        return _create_user_events()
@@ -1,32 +1,129 @@
 import base64
+import hashlib
+import io
 import os
+import time
 import uuid
-from typing import Annotated
+from typing import Annotated, BinaryIO, Iterator
 
-from fastapi import Depends
+from fastapi import BackgroundTasks, Depends
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from src.testovoe.db import User
+from src.testovoe.exception.avatar_too_large import AvatarTooLargeException
+from src.testovoe.exception.invalid_avatar import InvalidAvatarException
 from src.testovoe.main.config import Config
 from src.testovoe.main.dependencies import get_config
+from src.testovoe.main.dependencies.session import get_async_session_maker
+from src.testovoe.service.metrics import Metrics, get_metrics
+
+CHUNK_SIZE = 64 * 1024
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": ".jpg",
+    b"\x89PNG\r\n\x1a\n": ".png",
+    b"GIF87a": ".gif",
+    b"GIF89a": ".gif",
+}
 
 
 class FileService:
-    def __init__(self, config: Annotated[Config, Depends(get_config)]):
+    def __init__(
+        self,
+        config: Annotated[Config, Depends(get_config)],
+        tasks: BackgroundTasks,
+        metrics: Annotated[Metrics, Depends(get_metrics)],
+    ):
         self.base_dir = config.upload_dir
+        self.max_size = config.avatar_max_size
+        self.grace = config.avatar_gc_grace
+        self.tasks = tasks
+        self.metrics = metrics
+        self._released: set[str] = set()
         os.makedirs(self.base_dir, exist_ok=True)
 
     def save_base64(self, content_b64: str) -> str:
-        new_filename = f"{uuid.uuid4().hex}.jpg"
-        filepath = os.path.join(self.base_dir, new_filename)
-
-        with open(filepath, "wb") as f:
-            f.write(base64.b64decode(content_b64))
+        return self.save_stream(io.BytesIO(base64.b64decode(content_b64)))
 
+    def save_stream(self, source: BinaryIO) -> str:
+        chunk = source.read(CHUNK_SIZE)
+        extension = self._image_extension(chunk)
+        tmp_path = os.path.join(self.base_dir, f".upload-{uuid.uuid4().hex}")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                while chunk:
+                    size += len(chunk)
+                    if size > self.max_size:
+                        raise AvatarTooLargeException(self.max_size)
+                    digest.update(chunk)
+                    f.write(chunk)
+                    chunk = source.read(CHUNK_SIZE)
+            filepath = self.blob_path(digest.hexdigest(), extension)
+            if os.path.isfile(filepath):
+                os.remove(tmp_path)
+                os.utime(filepath)
+            else:
+                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                os.replace(tmp_path, filepath)
+                self.metrics.inc("avatar_bytes_written_total", size)
+        except BaseException:
+            self.delete_file(tmp_path)
+            raise
         return filepath
 
+    def blob_path(self, sha256: str, extension: str) -> str:
+        return os.path.join(self.base_dir, sha256[:2], sha256[2:4], f"{sha256}{extension}")
+
+    @staticmethod
+    def _image_extension(head: bytes) -> str:
+        for signature, extension in IMAGE_SIGNATURES.items():
+            if head.startswith(signature):
+                return extension
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return ".webp"
+        raise InvalidAvatarException()
+
     def delete_file(self, path: str) -> None:
         if path and os.path.isfile(path):
             os.remove(path)
 
-    def replace_file(self, new_file: str, old_path: str | None) -> str:
-        if old_path:
-            self.delete_file(old_path)
-        return self.save_base64(new_file)
+    def delete_orphan(self, path: str) -> None:
+        try:
+            if os.path.getmtime(path) < time.time() - self.grace:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def orphan_candidates(self, batch_size: int) -> Iterator[list[str]]:
+        batch = []
+        for root, _, files in os.walk(str(self.base_dir)):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) >= time.time() - self.grace:
+                        continue
+                except FileNotFoundError:
+                    continue
+                batch.append(path)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def release(self, path: str | None) -> None:
+        if path:
+            self._released.add(path)
+
+    def after_commit(self) -> None:
+        if self._released:
+            self.tasks.add_task(self.collect, sorted(self._released))
+            self._released.clear()
+
+    async def collect(self, paths: list[str]) -> None:
+        async with get_async_session_maker()() as session:
+            referenced = set(await session.scalars(select(User.avatar_path).where(User.avatar_path.in_(paths))))
+        for path in paths:
+            if path not in referenced:
+                await run_in_threadpool(self.delete_orphan, path)
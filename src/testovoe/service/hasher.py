@@ -0,0 +1,80 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+
+from passlib.hash import bcrypt
+from src.testovoe.exception.hasher_busy import HasherBusyException
+from src.testovoe.main.dependencies import get_config
+from src.testovoe.service.metrics import Metrics, get_metrics
+
+HASH_CHUNK_SIZE = 8
+DUMMY_HASH = "$2b$12$7fv4I8cpyx8uCmsY.MADf.GM48BXUPKpmMpJBEXzJV.lqgIlTTQwS"
+
+
+class PasswordHasher:
+    def __init__(self, executor: Executor, max_pending: int, workers: int, metrics: Metrics):
+        self.executor = executor
+        self.max_pending = max_pending
+        self.workers = workers
+        self.metrics = metrics
+        self.pending = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", bcrypt.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run("verify", bcrypt.verify, password, hashed_password)
+
+    async def verify_dummy(self, password: str) -> None:
+        await self._run("verify", bcrypt.verify, password, DUMMY_HASH)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        in_flight = asyncio.Semaphore(max(1, min(self.workers, self.max_pending // (2 * HASH_CHUNK_SIZE))))
+
+        async def hash_chunk(chunk: list[str]) -> list[str]:
+            async with in_flight:
+                self.pending += len(chunk)
+                started = time.perf_counter()
+                try:
+                    hashed = await asyncio.wrap_future(self.executor.submit(list, map(bcrypt.hash, chunk)))
+                finally:
+                    self.pending -= len(chunk)
+                elapsed = (time.perf_counter() - started) / len(chunk)
+                for _ in chunk:
+                    self.metrics.observe("password_hash_duration_seconds", elapsed, operation="hash")
+                return hashed
+
+        chunks = [passwords[i:i + HASH_CHUNK_SIZE] for i in range(0, len(passwords), HASH_CHUNK_SIZE)]
+        hashed = await asyncio.gather(*(hash_chunk(chunk) for chunk in chunks))
+        return [password for chunk in hashed for password in chunk]
+
+    async def _run(self, operation: str, func, *args):
+        if self.pending >= self.max_pending:
+            raise HasherBusyException(self.pending)
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(self.executor.submit(func, *args))
+        finally:
+            self.pending -= 1
+            self.metrics.observe("password_hash_duration_seconds", time.perf_counter() - started, operation=operation)
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_hasher() -> PasswordHasher:
+    cfg = get_config()
+    workers = cfg.hasher_workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return PasswordHasher(executor, cfg.hasher_max_pending, workers, get_metrics())
+
+
+def get_hasher() -> PasswordHasher:
+    with _lock:
+        return _create_hasher()
@@ -0,0 +1,108 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from functools import lru_cache
+
+from src.testovoe.exception.too_many_login_attempts import TooManyLoginAttemptsException
+from src.testovoe.main.dependencies import get_config
+
+SLOT = struct.Struct("<Qdd")
+PROBE = 4
+
+
+class LoginThrottle:
+    def __init__(
+        self, path: str, slots: int, user_burst: int, user_rate: float, client_burst: int, client_rate: float
+    ):
+        self.path = path
+        self.slots = slots
+        self.limits = {"user": (user_burst, user_rate), "client": (client_burst, client_rate)}
+        self._fd: int | None = None
+        self._map: mmap.mmap | None = None
+
+    def acquire(self, username: str, client: str | None) -> None:
+        keys = [("user", username)]
+        if client is not None:
+            keys.append(("client", client))
+        fd = self._open()
+        now = time.time()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            buckets = []
+            retry_after = 0.0
+            for kind, value in keys:
+                burst, rate = self.limits[kind]
+                if burst <= 0:
+                    continue
+                key = self._key(kind, value)
+                offset = self._find(key)
+                stored, tokens, updated = SLOT.unpack_from(self._map, offset)
+                if stored != key:
+                    tokens, updated = burst, now
+                tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+                if tokens < 1:
+                    retry_after = max(retry_after, (1 - tokens) / rate)
+                buckets.append((offset, key, tokens))
+            if retry_after:
+                raise TooManyLoginAttemptsException(retry_after)
+            for offset, key, tokens in buckets:
+                SLOT.pack_into(self._map, offset, key, tokens - 1, now)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _find(self, key: int) -> int:
+        start = key % self.slots
+        oldest = None
+        for i in range(PROBE):
+            offset = (start + i) % self.slots * SLOT.size
+            stored, _, updated = SLOT.unpack_from(self._map, offset)
+            if stored == key or stored == 0:
+                return offset
+            if oldest is None or updated < oldest[1]:
+                oldest = offset, updated
+        return oldest[0]
+
+    @staticmethod
+    def _key(kind: str, value: str) -> int:
+        digest = hashlib.blake2b(f"{kind}:{value}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def _open(self) -> int:
+        if self._fd is None:
+            size = self.slots * SLOT.size
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size != size:
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, size)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._map = mmap.mmap(fd, size)
+            self._fd = fd
+        return self._fd
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_login_throttle() -> LoginThrottle:
+    config = get_config()
+    return LoginThrottle(
+        config.login_throttle_file,
+        config.login_throttle_slots,
+        config.login_user_burst,
+        config.login_user_rate,
+        config.login_client_burst,
+        config.login_client_rate,
+    )
+
+
+def get_login_throttle() -> LoginThrottle:
+    with _lock:
+        return _create_login_throttle()
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.testovoe.main.dependencies import get_config
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FLUSH_INTERVAL = 1.0
+DESCRIPTIONS = {
+    "http_requests_in_progress": ("gauge", "Requests currently being handled"),
+    "http_request_duration_seconds": ("histogram", "Request latency by route"),
+    "db_query_duration_seconds": ("histogram", "SQL statement execution time"),
+    "db_pool_size": ("gauge", "Connection pool size"),
+    "db_pool_checked_in": ("gauge", "Idle connections in the pool"),
+    "db_pool_checked_out": ("gauge", "Connections checked out from the pool"),
+    "db_pool_overflow": ("gauge", "Connections opened above the pool size"),
+    "sse_subscribers": ("gauge", "Open /user/events streams"),
+    "password_hash_duration_seconds": ("histogram", "bcrypt hash/verify time"),
+    "avatar_bytes_written_total": ("counter", "Bytes of avatar files written to disk"),
+    "token_cache_hits_total": ("counter", "Token lookups served from the in-process cache"),
+    "token_cache_misses_total": ("counter", "Token lookups that missed the in-process cache"),
+    "token_cache_size": ("gauge", "Tokens held in the in-process cache"),
+}
+
+Labels = tuple[tuple[str, str], ...]
+GaugeCollector = Callable[[], Iterable[tuple[str, dict[str, str], float]]]
+
+
+class Metrics:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = defaultdict(float)
+        self._gauges: dict[tuple[str, Labels], float] = defaultdict(float)
+        self._histograms: dict[tuple[str, Labels], list[float]] = {}
+        self._collectors: list[GaugeCollector] = []
+        self._engines: set[int] = set()
+        self._flush_scheduled = False
+        os.makedirs(directory, exist_ok=True)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        with self._lock:
+            self._counters[name, self._labels(labels)] += value
+
+    def add(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges[name, self._labels(labels)] += value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = name, self._labels(labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(BUCKETS) + 3)
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram[i] += 1
+                    break
+            else:
+                histogram[len(BUCKETS)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def collect_gauges(self, collector: GaugeCollector) -> None:
+        self._collectors.append(collector)
+
+    def instrument_engine(self, engine: Engine | type[Engine]) -> None:
+        if id(engine) in self._engines:
+            return
+        self._engines.add(id(engine))
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+            self.observe("db_query_duration_seconds", elapsed, statement=statement.split(None, 1)[0].upper())
+
+    def schedule_flush(self) -> None:
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_later(FLUSH_INTERVAL, self.flush)
+
+    def flush(self) -> None:
+        self._flush_scheduled = False
+        with self._lock:
+            snapshot = {
+                "counters": self._dump(self._counters),
+                "gauges": self._dump(self._gauges),
+                "histograms": self._dump(self._histograms),
+            }
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                snapshot["gauges"].append([name, sorted(labels.items()), value])
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    def render(self) -> str:
+        self.flush()
+        counters: dict[tuple[str, Labels], float] = defaultdict(float)
+        gauges: dict[tuple[str, Labels], float] = {}
+        histograms: dict[tuple[str, Labels], list[float]] = {}
+        for name in os.listdir(self.directory):
+            pid, extension = os.path.splitext(name)
+            if extension != ".json":
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for metric, labels, value in snapshot["counters"]:
+                counters[metric, self._labels(labels)] += value
+            for metric, labels, values in snapshot["histograms"]:
+                if len(values) != len(BUCKETS) + 3:
+                    continue
+                key = metric, self._labels(labels)
+                current = histograms.setdefault(key, [0] * len(values))
+                histograms[key] = [a + b for a, b in zip(current, values)]
+            if self._alive(int(pid)):
+                for metric, labels, value in snapshot["gauges"]:
+                    gauges[metric, self._labels(dict(labels, pid=pid))] = value
+        lines = []
+        for name, (kind, description) in DESCRIPTIONS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for (metric, labels), values in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS, values):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self._format(labels + (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{self._format(labels + (('le', '+Inf'),))} {values[-1]}")
+                    lines.append(f"{name}_sum{self._format(labels)} {values[-2]}")
+                    lines.append(f"{name}_count{self._format(labels)} {values[-1]}")
+            else:
+                values = counters if kind == "counter" else gauges
+                for (metric, labels), value in sorted(values.items()):
+                    if metric == name:
+                        lines.append(f"{name}{self._format(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(labels: dict[str, str] | list) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in dict(labels).items()))
+
+    @staticmethod
+    def _dump(values: dict) -> list:
+        return [[name, list(labels), value] for (name, labels), value in values.items()]
+
+    @staticmethod
+    def _format(labels: Labels) -> str:
+        if not labels:
+            return ""
+        escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+        return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_metrics() -> Metrics:
+    return Metrics(get_config().metrics_dir)
+
+
+def get_metrics() -> Metrics:
+    with _lock:
+        return _create_metrics()
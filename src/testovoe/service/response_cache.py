@@ -0,0 +1,62 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Any
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from src.testovoe.main.dependencies import get_config
+from src.testovoe.service.data_version import DataVersion, get_data_version
+
+
+class ResponseCache:
+    def __init__(self, version: DataVersion, max_size: int):
+        self.version = version
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, str, int], bytes] = OrderedDict()
+
+    async def respond(
+        self, request: Request, produce: Callable[[], Awaitable[Any]], cacheable: Callable[[], bool] = lambda: True
+    ) -> Response:
+        version = self.version.get()
+        headers = {"ETag": f'"{version:x}"', "Cache-Control": "private, no-cache"}
+        if headers["ETag"] in self._if_none_match(request):
+            return Response(status_code=304, headers=headers)
+        key = (request.url.path, request.url.query, version)
+        body = self._entries.get(key)
+        if body is None:
+            content = await produce()
+            if isinstance(content, BaseModel):
+                body = content.model_dump_json().encode()
+            else:
+                body = JSONResponse(jsonable_encoder(content)).body
+            if not cacheable():
+                return Response(body, media_type="application/json", headers={"Cache-Control": "private, no-cache"})
+            if self.max_size > 0:
+                self._entries[key] = body
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return Response(body, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def _if_none_match(request: Request) -> list[str]:
+        value = request.headers.get("if-none-match", "")
+        return [tag.strip().removeprefix("W/") for tag in value.split(",")]
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_response_cache() -> ResponseCache:
+    return ResponseCache(get_data_version(), get_config().response_cache_size)
+
+
+def get_response_cache() -> ResponseCache:
+    with _lock:
+        return _create_response_cache()
+
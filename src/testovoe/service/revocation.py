@@ -0,0 +1,87 @@
+import asyncio
+import datetime as dt
+import threading
+import time
+from functools import lru_cache
+
+from sqlalchemy import select
+from src.testovoe.db import TokenRevocation
+from src.testovoe.main.dependencies import get_config
+from src.testovoe.main.dependencies.session import get_read_session_maker
+from src.testovoe.service.token_signer import TokenClaims
+
+
+class RevocationList:
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._tokens: set[str] = set()
+        self._users: dict[int, float] = {}
+        self._recent_tokens: dict[str, float] = {}
+        self._recent_users: dict[int, tuple[float, float]] = {}
+        self._loaded_at = float("-inf")
+        self._refreshing: asyncio.Task | None = None
+
+    async def is_revoked(self, claims: TokenClaims) -> bool:
+        await self._ensure_fresh()
+        return claims.jti in self._tokens or self._users.get(claims.uid, float("-inf")) >= claims.iat
+
+    def add_token(self, jti: str) -> None:
+        self._tokens.add(jti)
+        self._recent_tokens[jti] = time.monotonic()
+
+    def add_user(self, user_id: int, revoked_at: dt.datetime) -> None:
+        self._users[user_id] = max(self._users.get(user_id, float("-inf")), revoked_at.timestamp())
+        self._recent_users[user_id] = (time.monotonic(), self._users[user_id])
+
+    @staticmethod
+    def token_key(jti: str) -> str:
+        return f"token:{jti}"
+
+    @staticmethod
+    def user_key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    async def _ensure_fresh(self) -> None:
+        if time.monotonic() - self._loaded_at < self.refresh_interval:
+            return
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._refresh())
+        if self._loaded_at == float("-inf"):
+            await asyncio.shield(self._refreshing)
+
+    async def _refresh(self) -> None:
+        started = time.monotonic()
+        stmt = select(TokenRevocation.key, TokenRevocation.revoked_at).where(
+            TokenRevocation.expires_at > dt.datetime.now()
+        )
+        async with get_read_session_maker()() as session:
+            rows = (await session.execute(stmt)).all()
+        tokens = set()
+        users = {}
+        for key, revoked_at in rows:
+            kind, _, value = key.partition(":")
+            if kind == "token":
+                tokens.add(value)
+            elif kind == "user":
+                users[int(value)] = max(users.get(int(value), float("-inf")), revoked_at.timestamp())
+        self._recent_tokens = {jti: added for jti, added in self._recent_tokens.items() if added >= started}
+        self._recent_users = {uid: entry for uid, entry in self._recent_users.items() if entry[0] >= started}
+        tokens.update(self._recent_tokens)
+        for user_id, (_, revoked_at) in self._recent_users.items():
+            users[user_id] = max(users.get(user_id, float("-inf")), revoked_at)
+        self._tokens = tokens
+        self._users = users
+        self._loaded_at = time.monotonic()
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_revocation_list() -> RevocationList:
+    return RevocationList(get_config().token_revocation_refresh)
+
+
+def get_revocation_list() -> RevocationList:
+    with _lock:
+        return _create_revocation_list()
@@ -0,0 +1,80 @@
+import datetime as dt
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from src.testovoe.main.dependencies import get_config
+from src.testovoe.model import User
+from src.testovoe.service.metrics import Metrics, get_metrics
+
+
+class TokenCache:
+    def __init__(self, max_size: int, ttl: dt.timedelta, metrics: Metrics):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.metrics = metrics
+        self._entries: OrderedDict[str, tuple[User, dt.datetime]] = OrderedDict()
+        self._tokens_by_user: dict[int, set[str]] = {}
+
+    def get(self, token: str) -> User | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.metrics.inc("token_cache_misses_total")
+            return None
+        user, valid_until = entry
+        if valid_until < dt.datetime.now():
+            self._pop(token)
+            self.metrics.inc("token_cache_misses_total")
+            return None
+        self._entries.move_to_end(token)
+        self.metrics.inc("token_cache_hits_total")
+        return user
+
+    def put(self, token: str, user: User, expires_at: dt.datetime) -> None:
+        if self.max_size <= 0:
+            return
+        valid_until = min(expires_at, dt.datetime.now() + self.ttl)
+        self._pop(token)
+        self._entries[token] = (user, valid_until)
+        self._tokens_by_user.setdefault(user.id, set()).add(token)
+        while len(self._entries) > self.max_size:
+            self._pop(next(iter(self._entries)))
+
+    def invalidate_token(self, token: str) -> None:
+        self._pop(token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[0].id]
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_token_cache() -> TokenCache:
+    cfg = get_config()
+    return TokenCache(cfg.token_cache_size, dt.timedelta(seconds=cfg.token_cache_ttl), get_metrics())
+
+
+def get_token_cache() -> TokenCache:
+    with _lock:
+        return _create_token_cache()
@@ -0,0 +1,72 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+
+from pydantic import BaseModel
+from src.testovoe.main.dependencies import get_config
+
+SIGNED_TOKEN_PREFIX = "v1."
+
+
+class TokenClaims(BaseModel):
+    uid: int
+    adm: bool
+    iat: float
+    exp: int
+    jti: str
+
+
+class TokenSigner:
+    def __init__(self, secret: bytes, ttl: int):
+        self.secret = secret
+        self.ttl = ttl
+
+    def sign(self, user_id: int, is_admin: bool) -> tuple[str, TokenClaims]:
+        now = time.time()
+        claims = TokenClaims(uid=user_id, adm=is_admin, iat=now, exp=int(now) + self.ttl, jti=os.urandom(8).hex())
+        payload = self._encode(claims.model_dump_json().encode())
+        return f"{SIGNED_TOKEN_PREFIX}{payload}.{self._signature(payload)}", claims
+
+    def verify(self, token: str) -> TokenClaims | None:
+        if not token.startswith(SIGNED_TOKEN_PREFIX):
+            return None
+        payload, _, signature = token[len(SIGNED_TOKEN_PREFIX):].partition(".")
+        if not hmac.compare_digest(signature.encode(), self._signature(payload).encode()):
+            return None
+        try:
+            claims = TokenClaims.model_validate(json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))))
+        except ValueError:
+            return None
+        if claims.exp <= time.time():
+            return None
+        return claims
+
+    def _signature(self, payload: str) -> str:
+        return self._encode(hmac.new(self.secret, payload.encode(), hashlib.sha256).digest())
+
+    @staticmethod
+    def _encode(raw: bytes) -> str:
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+_lock = threading.Lock()
+
+
+@lru_cache
+def _create_token_signer() -> TokenSigner | None:
+    cfg = get_config()
+    if cfg.token_mode != "signed":
+        return None
+    if not cfg.token_secret:
+        raise ValueError("TOKEN_SECRET env variable is not set")
+    return TokenSigner(cfg.token_secret.encode(), cfg.token_ttl)
+
+
+def get_token_signer() -> TokenSigner | None:
+    with _lock:
+        return _create_token_signer()
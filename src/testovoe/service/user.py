@@ -1,140 +1,517 @@
+import base64
+import binascii
+import codecs
+import csv
 import datetime as dt
-from typing import Annotated
+import io
+import json
+from collections import Counter
+from typing import Annotated, Any, AsyncIterator, Literal, BinaryIO
+from zoneinfo import ZoneInfo
 
 from fastapi import Depends
-from sqlalchemy import select, func, cast, Date, extract
-from sqlalchemy.orm import joinedload
-from src.testovoe.db import User as UserDB
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import (
+    select, func, tuple_, Select, cast, Interval, delete, update, any_, bindparam, Integer, ColumnElement
+)
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy.orm import aliased
+from starlette.concurrency import run_in_threadpool
+from src.testovoe.db import User as UserDB, RegistrationStat
 from src.testovoe.exception import UserNotFoundException
-from src.testovoe.main.dependencies import DbSession
-from src.testovoe.model import UserPatch, User, UserIn
+from src.testovoe.exception.avatar_too_large import AvatarTooLargeException
+from src.testovoe.exception.invalid_avatar import InvalidAvatarException
+from src.testovoe.exception.invalid_cursor import InvalidCursorException
+from src.testovoe.main.dependencies import AsyncDbSession, ReadDbSession, get_config
+from src.testovoe.main.dependencies.session import get_read_session_maker
+from src.testovoe.model import (
+    UserPatch, User, UserIn, UserFilter, UserListQuery, UserPage, RegistrationSeriesQuery, RegistrationPoint,
+    UserImport, UserImportError, UserImportResult, UserSelection, UserBulkUpdate
+)
 from src.testovoe.service.auth import AuthService
+from src.testovoe.service.data_version import DataVersion, get_data_version
+from src.testovoe.service.events import UserEvents, get_user_events
 from src.testovoe.service.file import FileService
 
 
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = ["id", "name", "birth_year", "gender", "is_admin", "created_at", "created_by", "avatar_path"]
+IMPORT_BATCH_SIZE = 1000
+
+user_import_adapter = TypeAdapter(list[UserImport])
+user_list_adapter = TypeAdapter(list[User])
+
+
 class UserService:
     def __init__(
-        self, session: DbSession, auth: Annotated[AuthService, Depends()], file: Annotated[FileService, Depends()]
-        ):
+        self,
+        session: AsyncDbSession,
+        read_session: ReadDbSession,
+        auth: Annotated[AuthService, Depends()],
+        file: Annotated[FileService, Depends()],
+        version: Annotated[DataVersion, Depends(get_data_version)],
+        events: Annotated[UserEvents, Depends(get_user_events)],
+    ):
         self.session = session
+        self.read_session = read_session
         self.auth = auth
         self.file = file
+        self.version = version
+        self.events = events
+        self._registrations: Counter[dt.datetime] = Counter()
+
+    def read_from_primary(self) -> bool:
+        return not self.read_session.on_replica
+
+    @classmethod
+    def select_users(cls, filter_: UserFilter) -> Select:
+        sort_column = getattr(UserDB, filter_.sort)
+        if filter_.order == "asc":
+            order_by = (sort_column.asc(), UserDB.id.asc())
+        else:
+            order_by = (sort_column.desc(), UserDB.id.desc())
+        creator = aliased(UserDB)
+        return (
+            select(
+                UserDB.id,
+                UserDB.name,
+                UserDB.birth_year,
+                UserDB.gender,
+                UserDB.is_admin,
+                UserDB.created_at,
+                creator.name.label("created_by"),
+                UserDB.avatar_path,
+            )
+            .outerjoin(creator, UserDB.created_by_id == creator.id)
+            .where(*cls.filter_clauses(filter_))
+            .order_by(*order_by)
+        )
 
-    def all(self) -> list[User]:
-        users = self.session.scalars(select(UserDB).options(joinedload(UserDB.created_by)))
-        result = []
-        for user in users:
-            if user.created_by is not None:
-                name = user.created_by.name
+    @staticmethod
+    def filter_clauses(filter_: UserFilter) -> list[ColumnElement[bool]]:
+        clauses = []
+        if filter_.gender is not None:
+            clauses.append(UserDB.gender == filter_.gender)
+        if filter_.is_admin is not None:
+            clauses.append(UserDB.is_admin == filter_.is_admin)
+        if filter_.birth_year_from is not None:
+            clauses.append(UserDB.birth_year >= filter_.birth_year_from)
+        if filter_.birth_year_to is not None:
+            clauses.append(UserDB.birth_year <= filter_.birth_year_to)
+        if filter_.created_by is not None:
+            clauses.append(UserDB.created_by_id == filter_.created_by)
+        return clauses
+
+    def selection_clauses(self, selection: UserSelection) -> list[ColumnElement[bool]]:
+        clauses = []
+        if selection.ids is not None:
+            clauses.append(UserDB.id == any_(bindparam("ids", selection.ids, type_=ARRAY(Integer))))
+        if selection.filter is not None:
+            clauses.extend(self.filter_clauses(selection.filter))
+        return clauses
+
+    async def all(self, query: UserListQuery) -> UserPage:
+        stmt = self.select_users(query)
+        if query.cursor is not None:
+            value, last_id = self._decode_cursor(query.cursor, query.sort)
+            key = tuple_(getattr(UserDB, query.sort), UserDB.id)
+            if query.order == "asc":
+                stmt = stmt.where(key > tuple_(value, last_id))
             else:
-                name = None
-            user.created_by = None
-            user_app = User.model_validate(user)
-            user_app.created_by = name
-            result.append(user_app)
-        return result
+                stmt = stmt.where(key < tuple_(value, last_id))
+        rows = list(await self.read_session.execute(stmt.limit(query.limit + 1)))
+        next_cursor = None
+        if len(rows) > query.limit:
+            rows = rows[:query.limit]
+            last = rows[-1]
+            next_cursor = self._encode_cursor(getattr(last, query.sort), last.id)
+        return UserPage(items=user_list_adapter.validate_python(rows, from_attributes=True), next_cursor=next_cursor)
 
-    def get(self, user_id: int) -> User:
-        user = self.session.get(UserDB, user_id)
+    async def export(self, filter_: UserFilter, fmt: Literal["ndjson", "csv"]) -> AsyncIterator[str]:
+        stmt = self.select_users(filter_).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        if fmt == "csv":
+            yield self._csv_rows([EXPORT_FIELDS])
+        async with get_read_session_maker()() as session:
+            result = await session.stream(stmt)
+            async for partition in result.partitions():
+                users = user_list_adapter.validate_python(partition, from_attributes=True)
+                if fmt == "csv":
+                    yield self._csv_rows(
+                        [user.model_dump(mode="json")[field] for field in EXPORT_FIELDS] for user in users
+                    )
+                else:
+                    yield "".join(user.model_dump_json() + "\n" for user in users)
+
+    @staticmethod
+    def _csv_rows(rows) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _encode_cursor(value: Any, last_id: int) -> str:
+        if isinstance(value, dt.datetime):
+            value = value.isoformat()
+        raw = json.dumps([value, last_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: str) -> tuple[Any, int]:
+        try:
+            value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if sort == "created_at":
+                value = dt.datetime.fromisoformat(value)
+            elif sort in ("id", "birth_year"):
+                value = int(value)
+            return value, int(last_id)
+        except (ValueError, TypeError):
+            raise InvalidCursorException(cursor)
+
+    async def get(self, user_id: int) -> User:
+        user = await self.read_session.get(UserDB, user_id)
         if user:
             return User.model_validate(user)
         else:
             raise UserNotFoundException(user_id)
 
-    def create(self, user_: UserIn, created_by: int) -> int:
-        if user_.avatar_base64 is not None:
-            avatar_path = self.file.save_base64(user_.avatar_base64)
+    async def create(self, user_: UserIn, created_by: int, avatar: BinaryIO | None = None) -> int:
+        if avatar is not None:
+            avatar_path = await run_in_threadpool(self.file.save_stream, avatar)
+        elif user_.avatar_base64 is not None:
+            avatar_path = await run_in_threadpool(self.file.save_base64, user_.avatar_base64)
         else:
             avatar_path = None
         delattr(user_, 'avatar_base64')
         user_ = UserDB(**user_.model_dump())
-        user_.password = self.auth.get_password_hash(user_.password)
+        user_.password = await self.auth.get_password_hash(user_.password)
         user_.created_by_id = created_by
         user_.avatar_path = avatar_path
+        user_.created_at = dt.datetime.now()
         self.session.add(user_)
-        self.session.commit()
+        await self.session.flush()
+        await self._count_registrations(user_.created_at, 1)
+        await self._publish("user_created", [user_.id])
+        await self.session.commit()
+        self.version.bump()
         return user_.id
 
-    def delete(self, user_id: int) -> None:
-        user = self.session.get(UserDB, user_id)
+    async def bulk_create(
+        self, chunks: AsyncIterator[bytes], fmt: Literal["ndjson", "csv"], created_by: int
+    ) -> UserImportResult:
+        result = UserImportResult()
+        batch = []
+        async for row, record in self._import_records(chunks, fmt, result):
+            batch.append((row, record))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await self._import_batch(batch, created_by, result)
+                batch = []
+        if batch:
+            await self._import_batch(batch, created_by, result)
+        result.errors.sort(key=lambda error: error.row)
+        return result
+
+    async def _import_records(
+        self, chunks: AsyncIterator[bytes], fmt: Literal["ndjson", "csv"], result: UserImportResult
+    ) -> AsyncIterator[tuple[int, dict]]:
+        header = None
+        row = 0
+        async for line in self._lines(chunks):
+            row += 1
+            if not line.strip():
+                continue
+            if fmt == "csv":
+                values = next(csv.reader([line]))
+                if header is None:
+                    header = values
+                    continue
+                if len(values) != len(header):
+                    result.errors.append(UserImportError(row=row, error=f"Expected {len(header)} columns"))
+                    continue
+                yield row, {key: value for key, value in zip(header, values) if value != ""}
+            else:
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    result.errors.append(UserImportError(row=row, error=str(e)))
+                    continue
+                if not isinstance(record, dict):
+                    result.errors.append(UserImportError(row=row, error="Expected a JSON object"))
+                    continue
+                yield row, record
+
+    @staticmethod
+    async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        tail = ""
+        async for chunk in chunks:
+            *lines, tail = (tail + decoder.decode(chunk)).split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        tail += decoder.decode(b"", final=True)
+        if tail:
+            yield tail.rstrip("\r")
+
+    async def _import_batch(self, batch: list[tuple[int, dict]], created_by: int, result: UserImportResult) -> None:
+        try:
+            users = user_import_adapter.validate_python([record for _, record in batch])
+        except ValidationError as e:
+            invalid = {}
+            for error in e.errors():
+                index, *field = error["loc"]
+                invalid.setdefault(index, f"{'.'.join(map(str, field))}: {error['msg']}")
+            for index, message in sorted(invalid.items()):
+                result.errors.append(UserImportError(row=batch[index][0], error=message))
+            batch = [item for index, item in enumerate(batch) if index not in invalid]
+            users = user_import_adapter.validate_python([record for _, record in batch])
+        rows = [row for row, _ in batch]
+        avatars = []
+        for row, user_ in zip(rows, users):
+            avatar_path = None
+            if user_.avatar_base64 is not None:
+                try:
+                    avatar_path = await run_in_threadpool(self.file.save_base64, user_.avatar_base64)
+                except (binascii.Error, InvalidAvatarException, AvatarTooLargeException) as e:
+                    result.errors.append(UserImportError(row=row, error=f"avatar_base64: {e}"))
+                    continue
+            avatars.append((row, user_, avatar_path))
+        if not avatars:
+            return
+        hashes = await self.auth.get_password_hashes([user_.password for _, user_, _ in avatars])
+        created_at = dt.datetime.now()
+        stmt = insert(UserDB).values([
+            dict(
+                user_.model_dump(exclude={"password", "avatar_base64"}),
+                password=password,
+                avatar_path=avatar_path,
+                created_by_id=created_by,
+                created_at=created_at,
+            )
+            for (_, user_, avatar_path), password in zip(avatars, hashes)
+        ])
+        stmt = stmt.on_conflict_do_nothing(index_elements=[UserDB.name]).returning(UserDB.name, UserDB.id)
+        inserted = dict((await self.session.execute(stmt)).all())
+        created = []
+        for row, user_, avatar_path in avatars:
+            if user_.name in inserted:
+                created.append(inserted.pop(user_.name))
+            else:
+                result.errors.append(UserImportError(row=row, error=f"User {user_.name} already exists"))
+                self.file.release(avatar_path)
+        if created:
+            await self._count_registrations(created_at, len(created))
+            await self._publish("user_created", created)
+        await self.session.commit()
+        self.file.after_commit()
+        if created:
+            self.version.bump()
+        result.created += len(created)
+
+    async def delete(self, user_id: int) -> None:
+        user = await self.session.get(UserDB, user_id)
         if not user:
             raise UserNotFoundException(user_id)
         else:
-            if user.avatar_path is not None:
-                self.file.delete_file(user.avatar_path)
-            self.session.delete(user)
-            self.session.commit()
+            await self.session.delete(user)
+            await self._count_registrations(user.created_at, -1)
+            self.file.release(user.avatar_path)
+            await self.auth.revoke_users([user_id])
+            await self._publish("user_deleted", [user_id])
+            await self.session.commit()
+            self.file.after_commit()
+            self.version.bump()
+            self.auth.cache.invalidate_user(user_id)
 
-    def patch(self, user_id: int, new_user_data: UserPatch) -> None:
-        old_user = self.session.get(UserDB, user_id)
+    async def patch(self, user_id: int, new_user_data: UserPatch) -> None:
+        old_user = await self.session.get(UserDB, user_id)
+        old_avatar = old_user.avatar_path
+        old_is_admin = old_user.is_admin
         for key, value in new_user_data.model_dump().items():
             if value is not None:
                 if key == "password":
-                    value = self.auth.get_password_hash(value)
+                    value = await self.auth.get_password_hash(value)
                 if key == "avatar_base64":
                     key = "avatar_path"
-                    if old_user.avatar_path is not None:
-                        self.file.delete_file(old_user.avatar_path)
-                    value = self.file.save_base64(value)
+                    value = await run_in_threadpool(self.file.save_base64, value)
                 setattr(old_user, key, value)
         self.session.add(old_user)
-        self.session.commit()
+        if old_user.avatar_path != old_avatar:
+            self.file.release(old_avatar)
+        if old_user.is_admin != old_is_admin:
+            await self.auth.revoke_users([user_id])
+        await self._publish("user_updated", [user_id])
+        await self.session.commit()
+        self.file.after_commit()
+        self.version.bump()
+        self.auth.cache.invalidate_user(user_id)
 
-    def put(self, user_id: int, new_user_data: UserIn) -> None:
-        old_user = self.session.get(UserDB, user_id)
+    async def put(self, user_id: int, new_user_data: UserIn, avatar: BinaryIO | None = None) -> None:
+        old_user = await self.session.get(UserDB, user_id)
+        old_avatar = old_user.avatar_path
+        old_is_admin = old_user.is_admin
         change_pass = new_user_data.password is not None and new_user_data.password != ""
         for key, value in new_user_data.model_dump().items():
             if value is not None:
                 if key == "password":
                     if not change_pass:
                         continue
-                    value = self.auth.get_password_hash(value)
+                    value = await self.auth.get_password_hash(value)
                 if key == "avatar_base64":
                     key = "avatar_path"
-                    if old_user.avatar_path is not None:
-                        self.file.delete_file(old_user.avatar_path)
-                    value = self.file.save_base64(value)
+                    value = await run_in_threadpool(self.file.save_base64, value)
                 setattr(old_user, key, value)
             elif key != "password":
                 setattr(old_user, key, None)
+        if avatar is not None:
+            old_user.avatar_path = await run_in_threadpool(self.file.save_stream, avatar)
         self.session.add(old_user)
-        self.session.commit()
+        if old_user.avatar_path != old_avatar:
+            self.file.release(old_avatar)
+        if old_user.is_admin != old_is_admin:
+            await self.auth.revoke_users([user_id])
+        await self._publish("user_updated", [user_id])
+        await self.session.commit()
+        self.file.after_commit()
+        self.version.bump()
+        self.auth.cache.invalidate_user(user_id)
 
-    def group_by_minutes(self, day: dt.date, hour: int) -> dict[str, int]:
+    async def bulk_delete(self, selection: UserSelection, acting_user_id: int) -> int:
         stmt = (
-            select(
-                func.date_trunc("minute", UserDB.created_at).label("minute"),
-                func.count(UserDB.id).label("users_created"),
-            )
+            delete(UserDB)
+            .where(*self.selection_clauses(selection), UserDB.id != acting_user_id)
+            .returning(UserDB.id, UserDB.created_at, UserDB.avatar_path)
+        )
+        deleted = (await self.session.execute(stmt)).all()
+        if not deleted:
+            return 0
+        removed = Counter(created_at.replace(second=0, microsecond=0) for _, created_at, _ in deleted)
+        await self._count_registrations_by_minute({minute: -count for minute, count in removed.items()})
+        for _, _, avatar_path in deleted:
+            self.file.release(avatar_path)
+        await self.auth.revoke_users([user_id for user_id, _, _ in deleted])
+        await self._publish("user_deleted", [user_id for user_id, _, _ in deleted])
+        await self.session.commit()
+        self.file.after_commit()
+        self.version.bump()
+        for user_id, _, _ in deleted:
+            self.auth.cache.invalidate_user(user_id)
+        return len(deleted)
+
+    async def bulk_update(self, bulk: UserBulkUpdate) -> int:
+        values = bulk.data.model_dump(exclude_none=True)
+        if not values:
+            return 0
+        if "password" in values:
+            values["password"] = await self.auth.get_password_hash(values["password"])
+        if "avatar_base64" in values:
+            values["avatar_path"] = await run_in_threadpool(self.file.save_base64, values.pop("avatar_base64"))
+        old = (
+            select(UserDB.id, UserDB.avatar_path)
+            .where(*self.selection_clauses(bulk))
+            .with_for_update()
+            .subquery()
+        )
+        stmt = (
+            update(UserDB)
+            .where(UserDB.id == old.c.id)
+            .values(values)
+            .returning(UserDB.id, old.c.avatar_path)
+            .execution_options(synchronize_session=False)
+        )
+        updated = (await self.session.execute(stmt)).all()
+        if "avatar_path" in values:
+            for _, avatar_path in updated:
+                if avatar_path != values["avatar_path"]:
+                    self.file.release(avatar_path)
+            if not updated:
+                self.file.release(values["avatar_path"])
+        if "is_admin" in values:
+            await self.auth.revoke_users([user_id for user_id, _ in updated])
+        if updated:
+            await self._publish("user_updated", [user_id for user_id, _ in updated])
+        await self.session.commit()
+        self.file.after_commit()
+        if updated:
+            self.version.bump()
+        for user_id, _ in updated:
+            self.auth.cache.invalidate_user(user_id)
+        return len(updated)
+
+    async def _count_registrations(self, created_at: dt.datetime, delta: int) -> None:
+        await self._count_registrations_by_minute({created_at.replace(second=0, microsecond=0): delta})
+
+    async def _count_registrations_by_minute(self, deltas: dict[dt.datetime, int]) -> None:
+        await self.session.execute(RegistrationStat.count(deltas))
+        self._registrations.update(deltas)
+
+    async def _publish(self, event: str, ids: list[int]) -> None:
+        await self.events.publish(self.session, event, ids, self._registrations)
+        self._registrations.clear()
+
+    async def group_by_minutes(self, day: dt.date, hour: int) -> dict[str, int]:
+        start = dt.datetime.combine(day, dt.time(hour))
+        stmt = (
+            select(RegistrationStat.minute, RegistrationStat.users_created)
             .where(
-                cast(UserDB.created_at, Date) == day,
-                extract("hour", UserDB.created_at) == hour
+                RegistrationStat.minute >= start,
+                RegistrationStat.minute < start + dt.timedelta(hours=1),
+                RegistrationStat.users_created > 0,
             )
-            .group_by("minute")
-            .order_by("minute")
+            .order_by(RegistrationStat.minute)
         )
-        res = self.session.execute(stmt)
+        res = await self.read_session.execute(stmt)
         result = dict()
         d: dt.datetime
         for d, c in res:
             result[d.strftime("%H:%M")] = c
         return result
 
-    def group_by_hours(self, day: dt.date) -> dict[str, int]:
+    async def group_by_hours(self, day: dt.date) -> dict[str, int]:
+        start = dt.datetime.combine(day, dt.time())
+        hour = func.date_trunc("hour", RegistrationStat.minute).label("hour")
         stmt = (
-            select(
-                func.date_trunc("hour", UserDB.created_at).label("hour"),
-                func.count(UserDB.id).label("users_created"),
-            )
+            select(hour, func.sum(RegistrationStat.users_created).label("users_created"))
             .where(
-                cast(UserDB.created_at, Date) == day
+                RegistrationStat.minute >= start,
+                RegistrationStat.minute < start + dt.timedelta(days=1),
             )
-            .group_by("hour")
-            .order_by("hour")
+            .group_by(hour)
+            .having(func.sum(RegistrationStat.users_created) > 0)
+            .order_by(hour)
         )
-        res = self.session.execute(stmt)
+        res = await self.read_session.execute(stmt)
         result = dict()
         d: dt.datetime
         for d, c in res:
             result[d.strftime("%H")] = c
         return result
+
+    async def registration_series(self, query: RegistrationSeriesQuery) -> list[RegistrationPoint]:
+        zone = ZoneInfo(query.tz)
+        server_zone = ZoneInfo(get_config().tz)
+        local_minute = func.timezone(query.tz, func.timezone(server_zone.key, RegistrationStat.minute))
+        bucket = func.date_trunc(query.bucket, local_minute).label("bucket")
+        counts = (
+            select(bucket, func.sum(RegistrationStat.users_created).label("users_created"))
+            .where(
+                RegistrationStat.minute >= query.from_.astimezone(server_zone).replace(tzinfo=None),
+                RegistrationStat.minute < query.to.astimezone(server_zone).replace(tzinfo=None),
+            )
+            .group_by(bucket)
+            .subquery()
+        )
+        from_local = query.from_.astimezone(zone).replace(tzinfo=None)
+        to_local = query.to.astimezone(zone).replace(tzinfo=None)
+        series = select(
+            func.generate_series(
+                func.date_trunc(query.bucket, from_local),
+                to_local - dt.timedelta(microseconds=1),
+                cast(f"1 {query.bucket}", Interval),
+            ).label("bucket")
+        ).subquery()
+        stmt = (
+            select(series.c.bucket, func.coalesce(counts.c.users_created, 0))
+            .outerjoin(counts, counts.c.bucket == series.c.bucket)
+            .order_by(series.c.bucket)
+        )
+        res = await self.read_session.execute(stmt)
+        return [RegistrationPoint(start=d.replace(tzinfo=zone), count=c) for d, c in res]
@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from sqlalchemy import select
+from src.testovoe import create_app
+from src.testovoe.db import User
+from src.testovoe.main.dependencies import get_config
+from src.testovoe.main.dependencies.session import new_session
+from tests.benchmark.client import ASGIClient
+from tests.benchmark.scenarios import Scenario, scenarios
+from tests.benchmark.seed import SEED_PREFIX, cleanup, seed
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmark")
+    parser.add_argument("--users", type=int, default=10000, help="number of seeded users")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for requests per scenario")
+    parser.add_argument("--only", nargs="*", help="run only these scenarios")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--update-baseline", action="store_true")
+    return parser.parse_args()
+
+
+async def run_scenario(client: ASGIClient, token: str, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            call = scenario.call(i)
+            headers = {"X-Token": token} if call.auth else {}
+            started = time.perf_counter()
+            status, _ = await client.request(call.method, call.path, call.params, headers, call.json_body, call.client)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+def compare(name: str, result: dict, baseline: dict | None, tolerance: float) -> list[str]:
+    if baseline is None:
+        return []
+    failures = []
+    if result["rps"] < baseline["rps"] * (1 - tolerance):
+        failures.append(f"{name}: rps {result['rps']:.1f} < baseline {baseline['rps']:.1f}")
+    for key in ("p50", "p95", "p99"):
+        if result[key] > baseline[key] * (1 + tolerance):
+            failures.append(f"{name}: {key} {result[key]:.1f}ms > baseline {baseline[key]:.1f}ms")
+    return failures
+
+
+async def main(args: argparse.Namespace) -> int:
+    seed(args.users)
+    session = next(new_session())
+    seeded = list(session.execute(select(User.id, User.name).where(User.name.startswith(SEED_PREFIX)).limit(1000)))
+    session.close()
+    config = get_config()
+    client = ASGIClient(create_app())
+    status, body = await client.request(
+        "POST", "/auth/login", json_body={"username": config.root_username, "password": config.root_password}
+    )
+    if status != 200:
+        print(f"login failed: {status} {body.decode()}", file=sys.stderr)
+        return 1
+    token = json.loads(body)["token"]
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    results = {}
+    failures = []
+    print(f"{'scenario':<18}{'reqs':>7}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    try:
+        for scenario in scenarios(seeded):
+            if args.only and scenario.name not in args.only:
+                continue
+            requests = max(args.concurrency, int(scenario.requests * args.scale))
+            result = await run_scenario(client, token, scenario, requests, args.concurrency)
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<18}{result['requests']:>7}{result['errors']:>8}{result['rps']:>10.1f}"
+                f"{result['p50']:>10.1f}{result['p95']:>10.1f}{result['p99']:>10.1f}"
+            )
+            if result["errors"]:
+                failures.append(f"{scenario.name}: {result['errors']} requests failed")
+            failures.extend(compare(scenario.name, result, baselines.get(scenario.name), args.tolerance))
+    finally:
+        cleanup()
+
+    if args.update_baseline:
+        baselines.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
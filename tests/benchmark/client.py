@@ -0,0 +1,59 @@
+import json
+from typing import Any
+from urllib.parse import urlencode
+
+
+class ASGIClient:
+    def __init__(self, app):
+        self.app = app
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        json_body: Any = None,
+        client: str = "127.0.0.1",
+    ) -> tuple[int, bytes]:
+        body = b"" if json_body is None else json.dumps(json_body).encode()
+        raw_headers = [(b"host", b"benchmark")]
+        if json_body is not None:
+            raw_headers.append((b"content-type", b"application/json"))
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+        for key, value in (headers or {}).items():
+            raw_headers.append((key.lower().encode(), value.encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}).encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": (client, 0),
+            "server": ("benchmark", 80),
+        }
+        request_sent = False
+        status = 0
+        chunks = []
+
+        async def receive():
+            nonlocal request_sent
+            if request_sent:
+                return {"type": "http.disconnect"}
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
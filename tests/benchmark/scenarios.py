@@ -0,0 +1,81 @@
+import datetime as dt
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from tests.benchmark.seed import CREATED_PREFIX, SEED_PASSWORD
+
+
+@dataclass
+class Call:
+    method: str
+    path: str
+    params: dict[str, Any] | None = None
+    json_body: Any = None
+    auth: bool = True
+    client: str = "127.0.0.1"
+
+
+@dataclass
+class Scenario:
+    name: str
+    requests: int
+    call: Callable[[int], Call]
+
+
+def scenarios(seeded: list[tuple[int, str]]) -> list[Scenario]:
+    today = dt.date.today().isoformat()
+    sorts = ["created_at", "id", "name", "birth_year"]
+    return [
+        Scenario(
+            "auth_login",
+            20,
+            lambda i: Call(
+                "POST",
+                "/auth/login",
+                json_body={"username": seeded[i % len(seeded)][1], "password": SEED_PASSWORD},
+                auth=False,
+                client=f"10.0.{i // 256 % 256}.{i % 256}",
+            ),
+        ),
+        Scenario("auth_me", 1000, lambda i: Call("GET", "/auth/me")),
+        Scenario(
+            "user_list",
+            500,
+            lambda i: Call("GET", "/user/", params={"limit": 100, "sort": sorts[i % len(sorts)]}),
+        ),
+        Scenario(
+            "user_create",
+            20,
+            lambda i: Call(
+                "POST",
+                "/user/create",
+                json_body={
+                    "name": f"{CREATED_PREFIX}{uuid.uuid4().hex}",
+                    "birth_year": 1990,
+                    "gender": "male",
+                    "password": "bench",
+                    "avatar_base64": None,
+                },
+            ),
+        ),
+        Scenario(
+            "user_update",
+            200,
+            lambda i: Call(
+                "PATCH",
+                "/user/update",
+                params={"user_id": seeded[i % len(seeded)][0]},
+                json_body={
+                    "name": seeded[i % len(seeded)][1],
+                    "birth_year": 1950 + i % 60,
+                    "gender": "female",
+                    "password": "",
+                    "avatar_base64": None,
+                },
+            ),
+        ),
+        Scenario("group_by_minutes", 500, lambda i: Call("GET", "/user/group_by_minutes", {"day": today, "hour": i % 24})),
+        Scenario("group_by_hours", 500, lambda i: Call("GET", "/user/group_by_hours", {"day": today})),
+    ]
+
@@ -0,0 +1,56 @@
+import datetime as dt
+import random
+import runpy
+
+from passlib.hash import bcrypt
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from src.testovoe.db import User
+from src.testovoe.db.user import GenderEnum
+from src.testovoe.main.dependencies import get_config
+from src.testovoe.main.dependencies.session import new_session
+
+SEED_PREFIX = "bench_"
+CREATED_PREFIX = "benchnew_"
+SEED_PASSWORD = "bench"
+BATCH_SIZE = 5000
+
+
+def seed(users: int, days: int = 7) -> None:
+    config = get_config()
+    session = next(new_session())
+    root = session.scalars(select(User).where(User.name == config.root_username)).one_or_none()
+    if root is None:
+        runpy.run_module("src.testovoe.main.create_root_user")
+        root = session.scalars(select(User).where(User.name == config.root_username)).one()
+    existing = session.scalar(select(func.count()).where(User.name.startswith(SEED_PREFIX)))
+    password = bcrypt.hash(SEED_PASSWORD)
+    now = dt.datetime.now()
+    rng = random.Random(existing)
+    for start in range(existing, users, BATCH_SIZE):
+        rows = [
+            dict(
+                name=f"{SEED_PREFIX}{i}",
+                birth_year=rng.randint(1950, 2010),
+                gender=rng.choice(list(GenderEnum)),
+                is_admin=False,
+                password=password,
+                created_at=now - dt.timedelta(seconds=rng.randint(0, days * 24 * 3600)),
+                created_by_id=root.id,
+            )
+            for i in range(start, min(start + BATCH_SIZE, users))
+        ]
+        session.execute(insert(User).values(rows).on_conflict_do_nothing(index_elements=[User.name]))
+        session.commit()
+    rebuild_registration_stats()
+
+
+def cleanup() -> None:
+    session = next(new_session())
+    session.execute(delete(User).where(User.name.startswith(CREATED_PREFIX)))
+    session.commit()
+    rebuild_registration_stats()
+
+
+def rebuild_registration_stats() -> None:
+    runpy.run_module("src.testovoe.main.rebuild_registration_stats")
@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from src.testovoe.db import User as UserDB
+from src.testovoe.main.dependencies.session import get_async_session_maker
+from src.testovoe.model import User, UserFilter, UserPage
+from src.testovoe.service.user import UserService, user_list_adapter
+from tests.benchmark.seed import seed
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmark.serialization")
+    parser.add_argument("--users", type=int, default=10000, help="number of seeded users")
+    parser.add_argument("--limit", type=int, default=500, help="rows per page")
+    parser.add_argument("--rounds", type=int, default=50)
+    return parser.parse_args()
+
+
+async def orm_page(session, limit: int) -> bytes:
+    stmt = select(UserDB).options(joinedload(UserDB.created_by)).order_by(UserDB.created_at.desc(), UserDB.id.desc())
+    users = list(await session.scalars(stmt.limit(limit)))
+    page = UserPage(items=[User.from_db(user) for user in users])
+    return JSONResponse(jsonable_encoder(page)).body
+
+
+async def projected_page(session, limit: int) -> bytes:
+    stmt = UserService.select_users(UserFilter())
+    rows = list(await session.execute(stmt.limit(limit)))
+    page = UserPage(items=user_list_adapter.validate_python(rows, from_attributes=True))
+    return page.model_dump_json().encode()
+
+
+async def measure(produce, limit: int, rounds: int) -> float:
+    async with get_async_session_maker()() as session:
+        await produce(session, limit)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await produce(session, limit)
+            session.expunge_all()
+        elapsed = time.perf_counter() - started
+    return limit * rounds / elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    seed(args.users)
+    async with get_async_session_maker()() as session:
+        if await orm_page(session, args.limit) != await projected_page(session, args.limit):
+            raise SystemExit("serialized pages differ")
+    results = {}
+    for name, produce in (("orm", orm_page), ("projected", projected_page)):
+        results[name] = await measure(produce, args.limit, args.rounds)
+        print(f"{name:<12}{results[name]:>12.0f} rows/s")
+    print(f"{'speedup':<12}{results['projected'] / results['orm']:>12.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,92 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+STAGES = {
+    "import_db": """
+started = time.perf_counter()
+import src.testovoe.db
+result = time.perf_counter() - started
+""",
+    "import_session": """
+started = time.perf_counter()
+import src.testovoe.main.dependencies.session
+result = time.perf_counter() - started
+""",
+    "create_app": """
+started = time.perf_counter()
+from src.testovoe import create_app
+app = create_app()
+result = time.perf_counter() - started
+""",
+    "first_response": """
+started = time.perf_counter()
+from src.testovoe import create_app
+from tests.benchmark.client import ASGIClient
+status, _ = asyncio.run(ASGIClient(create_app()).request("GET", "/health/db"))
+assert status == 200, status
+result = time.perf_counter() - started
+""",
+    "preload_worker": """
+from src.testovoe import create_app
+from tests.benchmark.client import ASGIClient
+app = create_app()
+read_fd, write_fd = os.pipe()
+started = time.perf_counter()
+if os.fork() == 0:
+    status, _ = asyncio.run(ASGIClient(app).request("GET", "/health/db"))
+    os.write(write_fd, str(time.perf_counter() - started if status == 200 else -1).encode())
+    os._exit(0)
+os.wait()
+result = float(os.read(read_fd, 64))
+assert result >= 0
+""",
+}
+
+PRELUDE = "import asyncio, json, os, sys, time\n"
+EPILOGUE = "\nprint(json.dumps([result, len(sys.modules)]))\n"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmark.startup")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="run only these stages")
+    parser.add_argument(
+        "--budget", action="append", default=[], metavar="STAGE=MS", help="fail if the median exceeds the budget"
+    )
+    return parser.parse_args()
+
+
+def measure(code: str) -> tuple[float, int]:
+    output = subprocess.run(
+        [sys.executable, "-c", PRELUDE + code + EPILOGUE], capture_output=True, text=True, check=True
+    ).stdout
+    elapsed, modules = json.loads(output.splitlines()[-1])
+    return elapsed * 1000, modules
+
+
+def main(args: argparse.Namespace) -> int:
+    budgets = {}
+    for budget in args.budget:
+        stage, ms = budget.split("=")
+        budgets[stage] = float(ms)
+    failures = []
+    print(f"{'stage':<16}{'median ms':>11}{'min ms':>9}{'max ms':>9}{'modules':>9}")
+    for stage, code in STAGES.items():
+        if args.only and stage not in args.only:
+            continue
+        runs = [measure(code) for _ in range(args.runs)]
+        times = [elapsed for elapsed, _ in runs]
+        median = statistics.median(times)
+        print(f"{stage:<16}{median:>11.1f}{min(times):>9.1f}{max(times):>9.1f}{runs[-1][1]:>9}")
+        if stage in budgets and median > budgets[stage]:
+            failures.append(f"{stage}: {median:.1f}ms > budget {budgets[stage]:.1f}ms")
+    for failure in failures:
+        print(f"OVER BUDGET {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,36 @@
+import datetime as dt
+
+import pytest
+
+from src.testovoe.exception.invalid_cursor import InvalidCursorException
+from src.testovoe.service import UserService
+
+
+@pytest.mark.parametrize(
+    "sort, value",
+    [
+        ("created_at", dt.datetime(2026, 10, 18, 12, 30, 15, 123456)),
+        ("id", 42),
+        ("birth_year", 1990),
+        ("name", "Иван"),
+    ],
+)
+def test_cursor_round_trip(sort, value):
+    cursor = UserService._encode_cursor(value, 17)
+
+    assert UserService._decode_cursor(cursor, sort) == (value, 17)
+
+
+@pytest.mark.parametrize(
+    "cursor, sort",
+    [
+        ("not a cursor", "id"),
+        ("", "id"),
+        ("WzEsMl0=", "created_at"),
+        ("WyJ4IiwgMV0=", "id"),
+        ("WzFd", "id"),
+    ],
+)
+def test_invalid_cursor_is_rejected(cursor, sort):
+    with pytest.raises(InvalidCursorException):
+        UserService._decode_cursor(cursor, sort)
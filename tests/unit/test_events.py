@@ -0,0 +1,39 @@
+import datetime as dt
+import json
+
+from src.testovoe.service.events import NOTIFY_MAX_BYTES, UserEvents
+
+
+def merged(payloads: list[str]) -> tuple[list[int], dict[str, int]]:
+    ids, registrations = [], {}
+    for payload in payloads:
+        message = json.loads(payload)
+        ids.extend(message["ids"])
+        registrations.update(message["registrations"])
+    return ids, registrations
+
+
+def test_empty_event_is_one_payload():
+    assert [json.loads(p) for p in UserEvents._payloads("user_deleted", [], {})] == [
+        {"type": "user_deleted", "ids": [], "registrations": {}}
+    ]
+
+
+def test_small_event_is_one_payload():
+    payloads = UserEvents._payloads("user_created", [1, 2], {"2026-10-18T12:00:00": 2})
+
+    assert len(payloads) == 1
+    assert merged(payloads) == ([1, 2], {"2026-10-18T12:00:00": 2})
+
+
+def test_large_event_is_split_by_encoded_size():
+    ids = list(range(10 ** 12, 10 ** 12 + 3000))
+    start = dt.datetime(2026, 10, 18, tzinfo=dt.timezone.utc)
+    minutes = {(start + dt.timedelta(minutes=i)).isoformat(): -12345 for i in range(1440)}
+
+    payloads = UserEvents._payloads("user_deleted", ids, minutes)
+
+    assert len(payloads) > 1
+    assert all(len(payload.encode()) <= NOTIFY_MAX_BYTES for payload in payloads)
+    assert all(json.loads(payload)["type"] == "user_deleted" for payload in payloads)
+    assert merged(payloads) == (ids, minutes)
@@ -0,0 +1,95 @@
+import pytest
+from pydantic import ValidationError
+
+from src.testovoe.exception.too_many_login_attempts import TooManyLoginAttemptsException
+from src.testovoe.main.config import Config
+from src.testovoe.service import login_throttle
+from src.testovoe.service.login_throttle import LoginThrottle
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(login_throttle.time, "time", clock.time)
+    return clock
+
+
+def make_throttle(tmp_path, user_burst=3, user_rate=0.5, client_burst=0, client_rate=1.0) -> LoginThrottle:
+    return LoginThrottle(str(tmp_path / "throttle"), 64, user_burst, user_rate, client_burst, client_rate)
+
+
+def test_user_bucket_refills_at_rate(tmp_path, clock):
+    throttle = make_throttle(tmp_path)
+    for _ in range(3):
+        throttle.acquire("alice", None)
+    with pytest.raises(TooManyLoginAttemptsException) as e:
+        throttle.acquire("alice", None)
+    assert e.value.retry_after == 2
+
+    clock.now += 1
+    with pytest.raises(TooManyLoginAttemptsException):
+        throttle.acquire("alice", None)
+    clock.now += 1
+    throttle.acquire("alice", None)
+
+
+def test_users_have_separate_buckets(tmp_path, clock):
+    throttle = make_throttle(tmp_path, user_burst=1)
+    throttle.acquire("alice", None)
+    throttle.acquire("bob", None)
+    with pytest.raises(TooManyLoginAttemptsException):
+        throttle.acquire("alice", None)
+
+
+def test_client_bucket_is_disabled_by_default(tmp_path, clock):
+    throttle = make_throttle(tmp_path, user_burst=100)
+    for i in range(50):
+        throttle.acquire(f"user{i}", "10.0.0.1")
+
+
+def test_client_bucket_limits_many_usernames(tmp_path, clock):
+    throttle = make_throttle(tmp_path, user_burst=100, client_burst=2, client_rate=1.0)
+    throttle.acquire("alice", "10.0.0.1")
+    throttle.acquire("bob", "10.0.0.1")
+    with pytest.raises(TooManyLoginAttemptsException):
+        throttle.acquire("carol", "10.0.0.1")
+    throttle.acquire("carol", "10.0.0.2")
+
+
+def test_rejected_attempt_does_not_spend_tokens(tmp_path, clock):
+    throttle = make_throttle(tmp_path, user_burst=1, user_rate=1.0, client_burst=5, client_rate=1.0)
+    throttle.acquire("alice", "10.0.0.1")
+    for _ in range(10):
+        with pytest.raises(TooManyLoginAttemptsException):
+            throttle.acquire("alice", "10.0.0.1")
+    for name in ("bob", "carol", "dave", "erin"):
+        throttle.acquire(name, "10.0.0.1")
+
+
+def test_state_is_shared_through_the_file(tmp_path, clock):
+    make_throttle(tmp_path, user_burst=1).acquire("alice", None)
+    with pytest.raises(TooManyLoginAttemptsException):
+        make_throttle(tmp_path, user_burst=1).acquire("alice", None)
+
+
+@pytest.mark.parametrize("field", ["login_user_rate", "login_client_rate", "login_throttle_slots"])
+def test_config_rejects_non_positive_rates(tmp_path, field):
+    required = {
+        "db_uri": "postgresql+psycopg://localhost/test",
+        "upload_dir": tmp_path,
+        "root_username": "admin",
+        "root_password": "admin",
+        "nginx_proxy_prefix": "",
+        "static_files": "internal",
+    }
+    Config(**required)
+    with pytest.raises(ValidationError):
+        Config(**required, **{field: 0})
@@ -0,0 +1,68 @@
+import json
+
+from src.testovoe.service.metrics import BUCKETS, Metrics
+
+
+def rendered(metrics: Metrics, name: str) -> list[str]:
+    return [line for line in metrics.render().splitlines() if line.startswith(name)]
+
+
+def test_histogram_render(tmp_path):
+    metrics = Metrics(str(tmp_path))
+    for value in (0.003, 0.2, 0.3, 20):
+        metrics.observe("http_request_duration_seconds", value, route="/user/")
+
+    lines = rendered(metrics, "http_request_duration_seconds")
+
+    labels = 'route="/user/"'
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.25"}} 2' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.5"}} 3' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="10.0"}} 3' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in lines
+    assert f"http_request_duration_seconds_count{{{labels}}} 4" in lines
+    [sum_line] = [line for line in lines if line.startswith("http_request_duration_seconds_sum")]
+    assert float(sum_line.split()[-1]) == 20.503
+
+
+def test_histograms_and_counters_are_summed_across_processes(tmp_path):
+    other = {
+        "counters": [["avatar_bytes_written_total", [], 100]],
+        "gauges": [],
+        "histograms": [["password_hash_duration_seconds", [["operation", "hash"]], [0] * 7 + [2] + [0] * 4 + [1.5, 2]]],
+    }
+    (tmp_path / "999999999.json").write_text(json.dumps(other))
+    metrics = Metrics(str(tmp_path))
+    metrics.inc("avatar_bytes_written_total", 50)
+    metrics.observe("password_hash_duration_seconds", 0.3, operation="hash")
+
+    assert rendered(metrics, "avatar_bytes_written_total ") == ["avatar_bytes_written_total 150.0"]
+    lines = rendered(metrics, "password_hash_duration_seconds")
+    assert 'password_hash_duration_seconds_bucket{operation="hash",le="+Inf"} 3' in lines
+    assert 'password_hash_duration_seconds_count{operation="hash"} 3' in lines
+    assert 'password_hash_duration_seconds_sum{operation="hash"} 1.8' in lines
+
+
+def test_snapshots_with_old_histogram_layout_are_skipped(tmp_path):
+    stale = {
+        "counters": [],
+        "gauges": [],
+        "histograms": [["db_query_duration_seconds", [], [1] * (len(BUCKETS) + 2)]],
+    }
+    (tmp_path / "999999999.json").write_text(json.dumps(stale))
+    metrics = Metrics(str(tmp_path))
+    metrics.observe("db_query_duration_seconds", 0.002)
+
+    lines = rendered(metrics, "db_query_duration_seconds")
+
+    assert 'db_query_duration_seconds_bucket{le="+Inf"} 1' in lines
+    assert "db_query_duration_seconds_count 1" in lines
+
+
+def test_gauges_of_dead_processes_are_dropped(tmp_path):
+    dead = {"counters": [], "gauges": [["sse_subscribers", [], 3]], "histograms": []}
+    (tmp_path / "999999999.json").write_text(json.dumps(dead))
+    metrics = Metrics(str(tmp_path))
+    metrics.collect_gauges(lambda: [("sse_subscribers", {}, 1)])
+
+    assert [line.split()[-1] for line in rendered(metrics, "sse_subscribers{")] == ["1"]
@@ -0,0 +1,57 @@
+import pytest
+
+from src.testovoe.service import token_signer
+from src.testovoe.service.token_signer import SIGNED_TOKEN_PREFIX, TokenSigner
+
+
+@pytest.fixture
+def signer() -> TokenSigner:
+    return TokenSigner(b"secret", 3600)
+
+
+def test_signed_token_verifies(signer):
+    token, claims = signer.sign(7, True)
+
+    assert token.startswith(SIGNED_TOKEN_PREFIX)
+    assert signer.verify(token) == claims
+    assert claims.uid == 7 and claims.adm
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "af6bbad1-4bd9-4416-b925-b4db7a8bc379",
+        "v1.",
+        "v1.abc",
+        "v1.abc.def",
+        "v1.abc.\xe9",
+        "v1.\xe9.abc",
+        "v1.привет.привет",
+    ],
+)
+def test_malformed_tokens_are_rejected(signer, token):
+    assert signer.verify(token) is None
+
+
+def test_tampered_payload_is_rejected(signer):
+    token, _ = signer.sign(7, False)
+    payload, signature = token[len(SIGNED_TOKEN_PREFIX):].split(".")
+    forged, _ = signer.sign(1, True)
+    forged_payload = forged[len(SIGNED_TOKEN_PREFIX):].split(".")[0]
+
+    assert signer.verify(f"{SIGNED_TOKEN_PREFIX}{forged_payload}.{signature}") is None
+    assert signer.verify(f"{SIGNED_TOKEN_PREFIX}{payload}.{signature[:-1]}") is None
+
+
+def test_token_from_another_secret_is_rejected(signer):
+    token, _ = TokenSigner(b"other", 3600).sign(7, True)
+
+    assert signer.verify(token) is None
+
+
+def test_expired_token_is_rejected(signer, monkeypatch):
+    token, claims = signer.sign(7, False)
+    monkeypatch.setattr(token_signer.time, "time", lambda: claims.exp)
+
+    assert signer.verify(token) is None